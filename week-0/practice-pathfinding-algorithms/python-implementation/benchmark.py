@@ -0,0 +1,302 @@
+"""
+Benchmarks for the maze solver.
+
+Usage: python benchmark.py [frontier] [algorithms] [grid] [render] [jps] [queries] [mmap] [memory]
+"""
+
+import os
+import resource
+import subprocess
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from frontiers import QueueFrontier, DequeQueueFrontier
+from mapped_maze import MappedMaze
+from maze import Maze, ALGORITHMS
+from node import Node
+from paths import PathService
+
+MAZES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mazes")
+
+
+def open_maze(height, width):
+    """Returns the text of an empty maze with A and B in opposite corners."""
+    rows = [" " * width for _ in range(height)]
+    rows[0] = "A" + rows[0][1:]
+    rows[-1] = rows[-1][:-1] + "B"
+    return "\n".join(rows)
+
+
+def room_maze(height, width, room=25, door=3):
+    """
+    Returns the text of a maze divided into square rooms, each wall
+    pierced by a door, with A and B in opposite corners.
+    """
+    rows = []
+    for i in range(height):
+        if i % room == room - 1:
+            row = "".join(" " if j % room < door else "#" for j in range(width))
+        else:
+            row = "".join("#" if j % room == room - 1 and i % room >= door else " " for j in range(width))
+        rows.append(row)
+    rows[0] = "A" + rows[0][1:]
+    rows[-1] = rows[-1][:-1] + "B"
+    return "\n".join(rows)
+
+
+def random_maze(height, width, walls=0.25):
+    """Returns the text of a random maze with roughly the given wall density."""
+    threshold = int(256 * walls)
+    table = bytes(ord("#") if byte < threshold else ord(" ") for byte in range(256))
+    cells = bytearray(os.urandom(height * width).translate(table))
+    cells[0:1] = b"A"
+    cells[-1:] = b"B"
+    return b"\n".join(cells[i * width:(i + 1) * width] for i in range(height)).decode()
+
+
+def load_maze(text):
+    """Writes maze text to a temporary file and loads it."""
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(text)
+    try:
+        return Maze(f.name)
+    finally:
+        os.remove(f.name)
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def bfs(maze, frontier, node_class=Node):
+    """Plain BFS over maze using the given (empty) frontier."""
+    frontier.add(node_class(state=maze.start, parent=None, action=None))
+    explored = set()
+    while not frontier.empty():
+        node = frontier.remove()
+        if node.state == maze.goal:
+            return
+        explored.add(node.state)
+        for action, state in maze.neighbors(node.state):
+            if not frontier.contains_state(state) and state not in explored:
+                frontier.add(node_class(state=state, parent=node, action=action))
+
+
+def bench_frontier():
+    """Times BFS on growing open mazes; deque frontier time per cell stays flat."""
+    print(f"{'size':>10} {'cells':>10} {'list (s)':>10} {'deque (s)':>10} {'us/cell':>8}")
+    for n in (25, 50, 100, 200, 400, 800):
+        maze = load_maze(open_maze(n, n))
+        cells = n * n
+
+        # The list-backed frontier is quadratic, so only run it on small mazes
+        old = timed(bfs, maze, QueueFrontier()) if n <= 100 else None
+        new = timed(maze.solve)
+
+        old = f"{old:10.3f}" if old is not None else f"{'-':>10}"
+        print(f"{n:>4}x{n:<5} {cells:>10} {old} {new:10.3f} {new / cells * 1e6:8.2f}")
+
+
+def bench_algorithms():
+    """Compares states explored by each algorithm on the bundled and open mazes."""
+    mazes = [(name, Maze(os.path.join(MAZES, name))) for name in sorted(os.listdir(MAZES))]
+    mazes.append(("open 200x200", load_maze(open_maze(200, 200))))
+
+    print(f"{'maze':>14} {'algorithm':>13} {'explored':>10} {'length':>7} {'time (s)':>9}")
+    for name, maze in mazes:
+        for algorithm in ALGORITHMS:
+            elapsed = timed(maze.solve, algorithm=algorithm)
+            length = len(maze.solution[0])
+            print(f"{name:>14} {algorithm:>13} {maze.num_explored:>10} {length:>7} {elapsed:9.3f}")
+
+
+def legacy_walls(filename):
+    """The original list-of-lists wall parser, for comparison."""
+    with open(filename) as f:
+        contents = f.read().splitlines()
+    height = len(contents)
+    width = max(len(line) for line in contents)
+    walls = []
+    for i in range(height):
+        row = []
+        for j in range(width):
+            try:
+                row.append(contents[i][j] not in " AB")
+            except IndexError:
+                row.append(False)
+        walls.append(row)
+    return walls
+
+
+def bench_grid():
+    """Parse time and wall storage of the bytearray grid vs. the old list of lists."""
+    print(f"{'size':>12} {'parser':>8} {'parse (s)':>10} {'walls (MB)':>11}")
+    for n in (1000, 10000):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write(random_maze(n, n))
+        try:
+            if n <= 1000:
+                start = time.perf_counter()
+                walls = legacy_walls(f.name)
+                elapsed = time.perf_counter() - start
+                size = sys.getsizeof(walls) + sum(sys.getsizeof(row) for row in walls)
+                print(f"{n:>5}x{n:<6} {'lists':>8} {elapsed:10.3f} {size / 2 ** 20:11.1f}")
+                del walls
+
+            start = time.perf_counter()
+            maze = Maze(f.name)
+            elapsed = time.perf_counter() - start
+            size = sys.getsizeof(maze.grid) + sum(sys.getsizeof(row) for row in maze.walls)
+            print(f"{n:>5}x{n:<6} {'grid':>8} {elapsed:10.3f} {size / 2 ** 20:11.1f}")
+            del maze
+        finally:
+            os.remove(f.name)
+
+
+def bench_render():
+    """Times solving, printing and rendering an open maze with explored cells shown."""
+    maze = load_maze(open_maze(1000, 1000))
+    print(f"{'step':>8} {'time (s)':>9}")
+    print(f"{'solve':>8} {timed(maze.solve):9.3f}")
+
+    stdout = sys.stdout
+    with open(os.devnull, "w") as sys.stdout:
+        elapsed = timed(maze.print)
+    sys.stdout = stdout
+    print(f"{'print':>8} {elapsed:9.3f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "maze.png")
+        elapsed = timed(maze.output_image, filename, show_explored=True, cell_size=4, cell_border=1)
+    print(f"{'render':>8} {elapsed:9.3f}")
+
+
+def bench_jps():
+    """Compares Jump Point Search with BFS and A* on the bundled mazes and open-room maps."""
+    mazes = [(name, Maze(os.path.join(MAZES, name))) for name in sorted(os.listdir(MAZES))]
+    for n in (110, 310, 610):
+        mazes.append((f"open {n}x{n}", load_maze(open_maze(n, n))))
+        mazes.append((f"rooms {n}x{n}", load_maze(room_maze(n, n))))
+
+    print(f"{'maze':>16} {'algorithm':>9} {'explored':>10} {'length':>7} {'time (s)':>9}")
+    for name, maze in mazes:
+        for algorithm in ("bfs", "astar", "jps"):
+            elapsed = timed(maze.solve, algorithm=algorithm)
+            length = len(maze.solution[0])
+            print(f"{name:>16} {algorithm:>9} {maze.num_explored:>10} {length:>7} {elapsed:9.3f}")
+
+
+def bench_queries():
+    """Answers many start/goal queries with PathService vs. solving each from scratch."""
+    maze = load_maze(room_maze(310, 310))
+    rng = random.Random(0)
+    open_cells = [(i, j) for i in range(maze.height) for j in range(maze.width) if not maze.walls[i][j]]
+    goals = rng.sample(open_cells, 5)
+    queries = [(rng.choice(open_cells), rng.choice(goals)) for _ in range(200)]
+
+    def solve_each():
+        for maze.start, maze.goal in queries:
+            maze.solve(algorithm="astar")
+
+    def service():
+        paths = PathService(maze)
+        for start, goal in queries:
+            paths.query(start, goal)
+
+    print(f"{'method':>10} {'queries':>8} {'time (s)':>9}")
+    print(f"{'astar':>10} {len(queries):>8} {timed(solve_each):9.3f}")
+    print(f"{'service':>10} {len(queries):>8} {timed(service):9.3f}")
+
+
+def bench_mmap():
+    """Load time and peak Python memory of Maze vs. MappedMaze solving a large maze with A*."""
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(room_maze(3010, 3010))
+    try:
+        print(f"{'loader':>10} {'load (s)':>9} {'solve (s)':>10} {'peak (MB)':>10}")
+        for loader in (Maze, MappedMaze):
+            tracemalloc.start()
+            start = time.perf_counter()
+            maze = loader(f.name)
+            loaded = time.perf_counter() - start
+            elapsed = timed(maze.solve, algorithm="astar")
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{loader.__name__:>10} {loaded:9.3f} {elapsed:10.3f} {peak / 2 ** 20:10.1f}")
+            if loader is MappedMaze:
+                maze.close()
+            del maze
+    finally:
+        os.remove(f.name)
+
+
+class DictNode():
+    """The original Node, before __slots__: its attributes live in a per-instance __dict__."""
+
+    def __init__(self, state, parent, action, cost=0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.cost = cost
+
+
+def search_memory(mode, n):
+    """Solves an open n x n maze with BFS in the given mode; returns peak RSS in MB."""
+    maze = load_maze(open_maze(n, n))
+    if mode == "dict nodes":
+        bfs(maze, DequeQueueFrontier(), node_class=DictNode)
+    elif mode == "slot nodes":
+        bfs(maze, DequeQueueFrontier(), node_class=Node)
+    else:
+        maze.solve(compact=True)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_memory():
+    """
+    Peak RSS of BFS on a large open maze with the original and slotted
+    Node classes, both through the same bfs() loop, vs. the compact core.
+    """
+    n = 1000
+    print(f"{'mode':>12} {'cells':>10} {'peak RSS (MB)':>14}")
+    for mode in ("dict nodes", "slot nodes", "compact"):
+        # Peak RSS only grows, so measure each mode in a fresh interpreter
+        output = subprocess.run(
+            [sys.executable, __file__, "--memory", mode, str(n)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        print(f"{mode:>12} {n * n:>10} {float(output):14.1f}")
+
+
+BENCHMARKS = {
+    "frontier": bench_frontier,
+    "algorithms": bench_algorithms,
+    "grid": bench_grid,
+    "render": bench_render,
+    "jps": bench_jps,
+    "queries": bench_queries,
+    "mmap": bench_mmap,
+    "memory": bench_memory,
+}
+
+
+def main():
+    if sys.argv[1:2] == ["--memory"]:
+        print(search_memory(sys.argv[2], int(sys.argv[3])))
+        return
+
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            sys.exit(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+        print(f"== {name}")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Search core that keeps no Node objects.
+
+Cells are numbered row * width + col. Each cell's state lives in a
+single byte: the code of the action that first reached it (its parent
+is then one step back the other way), with the high bit set once the
+cell has been expanded. Paths are rebuilt by walking those bytes back
+from the goal.
+"""
+
+import heapq
+from array import array
+from collections import deque
+
+ACTIONS = ("up", "down", "left", "right")
+CODES = {action: code for code, action in enumerate(ACTIONS)}
+START = len(ACTIONS)
+UNSEEN = 0x7F
+EXPANDED = 0x80
+
+
+class ExploredCells():
+    """Set-like view of the cells a compact search expanded."""
+
+    def __init__(self, moves, width):
+        self.moves = moves
+        self.width = width
+
+    def __contains__(self, cell):
+        row, col = cell
+        return bool(self.moves[row * self.width + col] & EXPANDED)
+
+    def __iter__(self):
+        for index, move in enumerate(self.moves):
+            if move & EXPANDED:
+                yield divmod(index, self.width)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def solve(maze, algorithm, heuristic, instrument=None):
+    """
+    Runs "bfs", "dfs" or "astar" (guided by heuristic) on maze.
+
+    Returns ((actions, cells), num_explored, explored) like jps.solve.
+    """
+    width = maze.width
+    offsets = (-width, width, -1, 1)  # Cell id step for each action code
+    moves = bytearray([UNSEEN]) * (maze.height * width)
+
+    start = maze.start[0] * width + maze.start[1]
+    goal = maze.goal[0] * width + maze.goal[1]
+    moves[start] = START
+
+    if algorithm == "astar":
+        costs = array("i", [0]) * len(moves)
+        estimate = heuristic(maze.start, maze.goal)
+        frontier = [(estimate, estimate, start)]
+    elif algorithm in ("bfs", "dfs"):
+        frontier = deque([start])
+        remove = frontier.popleft if algorithm == "bfs" else frontier.pop
+    else:
+        raise Exception(f"compact search does not support {algorithm}")
+
+    num_explored = 0
+    while True:
+
+        # If nothing left in frontier, then no path
+        if not frontier:
+            raise Exception("no solution")
+
+        if algorithm == "astar":
+            cell = heapq.heappop(frontier)[2]
+            if moves[cell] & EXPANDED:
+                continue  # Stale entry for a cell reached more cheaply since
+        else:
+            cell = remove()
+        num_explored += 1
+        if instrument is not None:
+            instrument.pop(divmod(cell, width), len(frontier))
+
+        if cell == goal:
+            return path(moves, offsets, goal, width), num_explored, ExploredCells(moves, width)
+
+        moves[cell] |= EXPANDED
+        if instrument is not None:
+            instrument.expand(divmod(cell, width))
+
+        for action, state in maze.neighbors(divmod(cell, width)):
+            neighbor = state[0] * width + state[1]
+            move = moves[neighbor]
+            if move & EXPANDED:
+                continue
+            if algorithm == "astar":
+                cost = costs[cell] + 1
+                if move != UNSEEN and costs[neighbor] <= cost:
+                    continue
+                costs[neighbor] = cost
+                moves[neighbor] = CODES[action]
+                estimate = heuristic(state, maze.goal)
+                heapq.heappush(frontier, (cost + estimate, estimate, neighbor))
+            elif move == UNSEEN:
+                moves[neighbor] = CODES[action]
+                frontier.append(neighbor)
+            else:
+                continue
+            if instrument is not None:
+                instrument.push(state, len(frontier))
+
+
+def path(moves, offsets, goal, width):
+    """Walks the action bytes back from goal into (actions, cells)."""
+    actions = []
+    cells = []
+    cell = goal
+    while True:
+        code = moves[cell] & ~EXPANDED
+        if code == START:
+            break
+        actions.append(ACTIONS[code])
+        cells.append(divmod(cell, width))
+        cell -= offsets[code]
+    actions.reverse()
+    cells.reverse()
+    return actions, cells
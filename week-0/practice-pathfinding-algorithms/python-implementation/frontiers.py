@@ -1,3 +1,8 @@
+import heapq
+import itertools
+from collections import deque
+
+
 class StackFrontier():
     def __init__(self):
         self.frontier = []
@@ -11,6 +16,9 @@ class StackFrontier():
     def empty(self):
         return len(self.frontier) == 0
 
+    def __len__(self):
+        return len(self.frontier)
+
     def remove(self):
         if self.empty():
             raise Exception("Frontier is empty.")
@@ -23,4 +31,93 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("Frontier is empty.")
         else:
-            return self.frontier.pop(0)
\ No newline at end of file
+            return self.frontier.pop(0)
+
+
+class DequeStackFrontier():
+    """
+    Stack frontier backed by a deque, with a companion set of the states
+    currently in the frontier so membership checks are O(1).
+
+    Assumes a state is added at most once while it is in the frontier,
+    which is what the search loops guarantee via contains_state.
+    """
+
+    def __init__(self):
+        self.frontier = deque()
+        self.states = set()
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states.add(node.state)
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def remove(self):
+        if self.empty():
+            raise Exception("Frontier is empty.")
+        node = self.frontier.pop()
+        self.states.discard(node.state)
+        return node
+
+
+class DequeQueueFrontier(DequeStackFrontier):
+    def remove(self):
+        if self.empty():
+            raise Exception("Frontier is empty.")
+        node = self.frontier.popleft()
+        self.states.discard(node.state)
+        return node
+
+
+class PriorityFrontier():
+    """
+    Min-heap frontier ordered by priority(node), ties broken by insertion
+    order.
+
+    Adding a state that is already in the frontier keeps whichever of the
+    two nodes has the lower priority; the superseded heap entry is dropped
+    lazily when it reaches the top.
+    """
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.frontier = []
+        self.entries = {}
+        self.counter = itertools.count()
+
+    def add(self, node):
+        priority = self.priority(node)
+        entry = self.entries.get(node.state)
+        if entry is not None:
+            if entry[0] <= priority:
+                return
+            entry[2] = None  # Superseded
+        entry = [priority, next(self.counter), node]
+        self.entries[node.state] = entry
+        heapq.heappush(self.frontier, entry)
+
+    def contains_state(self, state):
+        return state in self.entries
+
+    def empty(self):
+        return len(self.entries) == 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def remove(self):
+        if self.empty():
+            raise Exception("Frontier is empty.")
+        while True:
+            node = heapq.heappop(self.frontier)[2]
+            if node is not None:
+                del self.entries[node.state]
+                return node
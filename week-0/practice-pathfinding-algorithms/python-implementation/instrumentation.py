@@ -0,0 +1,101 @@
+"""
+Optional instrumentation for maze searches.
+
+Pass a SearchInstrumentation to Maze.solve(instrument=...) to count
+pushes, pops and expansions, track the peak frontier size and time named
+phases. Each event can also be forwarded to a callback or recorded for a
+trace. Searches only pay for this when an instrument is given.
+"""
+
+import time
+from contextlib import contextmanager
+
+
+class SearchInstrumentation():
+    def __init__(self, on_expand=None, on_push=None, on_pop=None, record=False):
+        self.on_expand = on_expand
+        self.on_push = on_push
+        self.on_pop = on_pop
+        self.events = [] if record else None
+
+        self.expanded = 0
+        self.pushed = 0
+        self.popped = 0
+        self.peak_frontier = 0
+        self.nodes_allocated = 0
+        self.phases = {}
+
+    def expand(self, state):
+        self.expanded += 1
+        if self.events is not None:
+            self.events.append(("expand", *state))
+        if self.on_expand is not None:
+            self.on_expand(state)
+
+    def push(self, state, frontier_size, node=None):
+        self.pushed += 1
+        if node is not None:
+            self.nodes_allocated += 1
+        self.peak_frontier = max(self.peak_frontier, frontier_size)
+        if self.events is not None:
+            self.events.append(("push", *state))
+        if self.on_push is not None:
+            self.on_push(state, frontier_size)
+
+    def pop(self, state, frontier_size):
+        self.popped += 1
+        if self.events is not None:
+            self.events.append(("pop", *state))
+        if self.on_pop is not None:
+            self.on_pop(state, frontier_size)
+
+    @contextmanager
+    def phase(self, name):
+        """Adds the time spent inside the with block to the named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0) + time.perf_counter() - start
+
+    def frontier(self, frontier):
+        """Wraps a frontier so its adds and removes are reported here."""
+        return InstrumentedFrontier(frontier, self)
+
+    def report(self):
+        """Returns the counters and phase timings as a JSON-friendly dict."""
+        report = {
+            "expanded": self.expanded,
+            "pushed": self.pushed,
+            "popped": self.popped,
+            "peak_frontier": self.peak_frontier,
+            "nodes_allocated": self.nodes_allocated,
+            "phases": dict(self.phases),
+        }
+        if self.events is not None:
+            report["events"] = self.events
+        return report
+
+
+class InstrumentedFrontier():
+    def __init__(self, frontier, instrument):
+        self.inner = frontier
+        self.instrument = instrument
+
+    def add(self, node):
+        self.inner.add(node)
+        self.instrument.push(node.state, len(self.inner), node)
+
+    def contains_state(self, state):
+        return self.inner.contains_state(state)
+
+    def empty(self):
+        return self.inner.empty()
+
+    def remove(self):
+        node = self.inner.remove()
+        self.instrument.pop(node.state, len(self.inner))
+        return node
+
+    def __len__(self):
+        return len(self.inner)
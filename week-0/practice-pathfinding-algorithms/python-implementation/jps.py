@@ -0,0 +1,150 @@
+"""
+Jump Point Search for 4-connected, uniform-cost mazes.
+
+Among the many equally short paths through open space, only the one that
+moves vertically as early as possible is searched. A horizontal run may
+only turn where a wall forced it to (the cell diagonally behind the turn
+is blocked), and a vertical run stops wherever a horizontal scan from it
+finds such a turn. That leaves A* to expand just the jump points where
+paths can usefully change direction, instead of every open cell.
+"""
+
+from frontiers import PriorityFrontier
+from node import Node
+
+# Directions as (row step, column step)
+DIRECTIONS = {
+    "up": (-1, 0),
+    "down": (1, 0),
+    "left": (0, -1),
+    "right": (0, 1),
+}
+
+
+def is_open(maze, row, col):
+    return 0 <= row < maze.height and 0 <= col < maze.width and not maze.walls[row][col]
+
+
+def jump_horizontal(maze, row, col, dc):
+    """
+    Returns the next jump point moving dc columns at a time from (row, col),
+    or None if the run hits a wall first.
+    """
+    while True:
+        col += dc
+        if not is_open(maze, row, col):
+            return None
+        if (row, col) == maze.goal:
+            return (row, col)
+
+        # Forced neighbor: open above/below, blocked diagonally behind
+        for dr in (-1, 1):
+            if is_open(maze, row + dr, col) and not is_open(maze, row + dr, col - dc):
+                return (row, col)
+
+
+def jump_vertical(maze, row, col, dr):
+    """
+    Returns the next jump point moving dr rows at a time from (row, col),
+    or None if the run hits a wall first.
+    """
+    while True:
+        row += dr
+        if not is_open(maze, row, col):
+            return None
+        if (row, col) == maze.goal:
+            return (row, col)
+
+        # Stop wherever a horizontal run would find a jump point
+        if jump_horizontal(maze, row, col, -1) or jump_horizontal(maze, row, col, 1):
+            return (row, col)
+
+
+def successors(maze, node):
+    """Returns (action, jump point) pairs reachable from node."""
+    row, col = node.state
+
+    # Directions worth trying given how we arrived here
+    if node.action is None:
+        actions = list(DIRECTIONS)
+    elif node.action in ("up", "down"):
+        actions = [node.action, "left", "right"]
+    else:
+        dc = DIRECTIONS[node.action][1]
+        actions = [node.action]
+        if is_open(maze, row - 1, col) and not is_open(maze, row - 1, col - dc):
+            actions.append("up")
+        if is_open(maze, row + 1, col) and not is_open(maze, row + 1, col - dc):
+            actions.append("down")
+
+    result = []
+    for action in actions:
+        dr, dc = DIRECTIONS[action]
+        if dr:
+            point = jump_vertical(maze, row, col, dr)
+        else:
+            point = jump_horizontal(maze, row, col, dc)
+        if point is not None:
+            result.append((action, point))
+    return result
+
+
+def solve(maze, instrument=None):
+    """
+    Finds a shortest solution to maze.
+
+    Returns ((actions, cells), num_explored, explored) where the solution
+    has the same shape as Maze.solution and explored is the set of jump
+    points expanded.
+    """
+    goal = maze.goal
+
+    def priority(node):
+        estimate = abs(node.state[0] - goal[0]) + abs(node.state[1] - goal[1])
+        return (node.cost + estimate, estimate)
+
+    frontier = PriorityFrontier(priority)
+    if instrument is not None:
+        frontier = instrument.frontier(frontier)
+    frontier.add(Node(state=maze.start, parent=None, action=None))
+    explored = set()
+    num_explored = 0
+
+    while True:
+        if frontier.empty():
+            raise Exception("no solution")
+
+        node = frontier.remove()
+        num_explored += 1
+
+        if node.state == goal:
+            return path(node), num_explored, explored
+
+        explored.add(node.state)
+        if instrument is not None:
+            instrument.expand(node.state)
+
+        for action, state in successors(maze, node):
+            if state in explored:
+                continue
+            distance = abs(state[0] - node.state[0]) + abs(state[1] - node.state[1])
+            frontier.add(Node(state=state, parent=node, action=action, cost=node.cost + distance))
+
+
+def path(node):
+    """Expands the jump points leading to node into single-cell (actions, cells)."""
+    segments = []
+    while node.parent is not None:
+        segments.append(node)
+        node = node.parent
+
+    actions = []
+    cells = []
+    row, col = node.state
+    for node in reversed(segments):
+        dr, dc = DIRECTIONS[node.action]
+        while (row, col) != node.state:
+            row, col = row + dr, col + dc
+            actions.append(node.action)
+            cells.append((row, col))
+    return actions, cells
@@ -1,19 +1,125 @@
-import sys
-from maze import Maze
+import argparse
+import json
+import os
+
+from mapped_maze import MappedMaze
+from maze import Maze, ALGORITHMS, HEURISTICS
+from instrumentation import SearchInstrumentation
+from paths import PathService, read_queries
+
 
 def main():
-    if len(sys.argv) != 2:
-        sys.exit("Usage: python maze.py maze.txt")
+    parser = argparse.ArgumentParser(description="Solve a maze.")
+    parser.add_argument("maze", help="maze text file (or, with --profile, a directory of them)")
+    parser.add_argument("--algorithm", choices=ALGORITHMS + ("all",), default="bfs",
+                        help="search algorithm; \"all\" is only allowed with --profile")
+    parser.add_argument("--heuristic", choices=list(HEURISTICS), default="manhattan")
+    parser.add_argument("--queries", metavar="FILE",
+                        help="answer the start/goal pairs in FILE instead of solving A to B")
+    parser.add_argument("--cache-size", type=int, default=8,
+                        help="number of goal distance fields kept for --queries")
+    parser.add_argument("--mmap", action="store_true",
+                        help="memory-map the maze file instead of loading it; skips printing and the image")
+    parser.add_argument("--profile", action="store_true",
+                        help="print search counters and phase timings instead of the solution")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="with --profile, also write every report and search event to FILE as JSON")
+    args = parser.parse_args()
+
+    if args.profile:
+        profile(args)
+        return
+    if args.algorithm == "all":
+        parser.error("--algorithm all requires --profile")
+
+    m = MappedMaze(args.maze) if args.mmap else Maze(args.maze)
+    if args.queries:
+        answer_queries(m, args.queries, args.cache_size)
+        return
+
+    if args.mmap:
+        print(f"Solving {m.height}x{m.width} maze with {args.algorithm}...")
+        m.solve(algorithm=args.algorithm, heuristic=args.heuristic)
+        print("States Explored:", m.num_explored)
+        print("Solution Length:", len(m.solution[0]))
+        return
 
-    m = Maze(sys.argv[1])
     print("Maze:")
     m.print()
-    print("Solving...")
-    m.solve()
+    print(f"Solving with {args.algorithm}...")
+    m.solve(algorithm=args.algorithm, heuristic=args.heuristic)
     print("States Explored:", m.num_explored)
     print("Solution:")
     m.print()
     m.output_image("maze.png", show_explored=True)
 
+
+def answer_queries(m, filename, cache_size):
+    """
+    Prints "start goal length actions" for each query, as it is answered,
+    or the query line followed by an error, without stopping the run, if
+    it is malformed or names a wall or a cell outside the maze.
+    """
+    service = PathService(m, cache_size=cache_size)
+    for line, start, goal in read_queries(filename):
+        if start is None:
+            print(line, "error: expected start_row start_col goal_row goal_col", flush=True)
+            continue
+        try:
+            solution = service.query(start, goal)
+        except Exception as error:
+            print(line, f"error: {error}", flush=True)
+            continue
+
+        if solution is None:
+            print(*start, *goal, "no solution", flush=True)
+        else:
+            actions, cells = solution
+            print(*start, *goal, len(actions), ",".join(actions), flush=True)
+
+
+def profile(args):
+    """Solves each maze with each algorithm under instrumentation and reports the counters."""
+    if os.path.isdir(args.maze):
+        filenames = sorted(os.path.join(args.maze, name) for name in os.listdir(args.maze) if name.endswith(".txt"))
+    else:
+        filenames = [args.maze]
+    algorithms = ALGORITHMS if args.algorithm == "all" else (args.algorithm,)
+    loader = MappedMaze if args.mmap else Maze
+
+    reports = []
+    print(f"{'maze':>20} {'algorithm':>13} {'explored':>9} {'pushed':>9} {'popped':>9} "
+          f"{'peak':>8} {'nodes':>9} {'load ms':>8} {'solve ms':>9}")
+    for filename in filenames:
+        for algorithm in algorithms:
+            instrument = SearchInstrumentation(record=args.trace is not None)
+            with instrument.phase("load"):
+                m = loader(filename)
+            with instrument.phase("solve"):
+                try:
+                    m.solve(algorithm=algorithm, heuristic=args.heuristic, instrument=instrument)
+                except Exception:
+                    m.solution = None  # No solution
+
+            report = instrument.report()
+            report.update(
+                maze=filename,
+                algorithm=algorithm,
+                num_explored=m.num_explored,
+                solution_length=len(m.solution[0]) if m.solution is not None else None,
+            )
+            reports.append(report)
+
+            phases = report["phases"]
+            print(f"{os.path.basename(filename):>20} {algorithm:>13} {report['expanded']:>9} "
+                  f"{report['pushed']:>9} {report['popped']:>9} {report['peak_frontier']:>8} "
+                  f"{report['nodes_allocated']:>9} {phases['load'] * 1000:8.2f} {phases['solve'] * 1000:9.2f}")
+
+    if args.trace:
+        with open(args.trace, "w") as f:
+            json.dump(reports, f)
+        print(f"Trace written to {args.trace}")
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,132 @@
+"""
+Maze backed by a memory-mapped file, for mazes too big to load.
+
+Only the byte offset of each row is read up front; wall lookups go
+straight to the mapped file, so the operating system pages in just the
+parts of the maze a search actually touches. Each byte of the file is
+one cell, so maze files must be ASCII.
+"""
+
+import mmap
+from array import array
+from bisect import bisect_right
+
+from maze import Maze
+
+# Bytes that are not walls
+OPEN = b" AB"
+
+
+class MappedRow():
+    def __init__(self, buffer, offset, length, width):
+        self.buffer = buffer
+        self.offset = offset
+        self.length = length
+        self.width = width
+
+    def __getitem__(self, col):
+        if col >= self.length:
+            return False  # Short rows are padded with open cells
+        return self.buffer[self.offset + col] not in OPEN
+
+    def __len__(self):
+        return self.width
+
+    def __iter__(self):
+        return (self[col] for col in range(self.width))
+
+
+class MappedWalls():
+    """Read-only walls[row][col] view over a mapped maze file."""
+
+    def __init__(self, maze):
+        self.maze = maze
+
+    def __getitem__(self, row):
+        maze = self.maze
+        return MappedRow(maze.map, maze.offsets[row], maze.lengths[row], maze.width)
+
+    def __len__(self):
+        return self.maze.height
+
+    def __iter__(self):
+        return (self[row] for row in range(self.maze.height))
+
+
+class MappedMaze(Maze):
+    def __init__(self, filename):
+
+        # Map the file rather than reading it
+        with open(filename, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Validate start and goal
+        start = self.map.find(b"A")
+        if start == -1 or self.map.find(b"A", start + 1) != -1:
+            raise Exception("maze must have exactly one start point")
+        goal = self.map.find(b"B")
+        if goal == -1 or self.map.find(b"B", goal + 1) != -1:
+            raise Exception("maze must have exactly one goal")
+
+        # Index where each row starts and how many cells it holds
+        self.offsets = array("q")
+        self.lengths = array("q")
+        offset = 0
+        size = len(self.map)
+        while offset < size:
+            end = self.map.find(b"\n", offset)
+            if end == -1:
+                end = size
+            length = end - offset
+            if length and self.map[end - 1] == ord("\r"):
+                length -= 1
+            self.offsets.append(offset)
+            self.lengths.append(length)
+            offset = end + 1
+
+        # Determine height and width of maze
+        self.height = len(self.offsets)
+        self.width = max(self.lengths)
+
+        self.start = self.cell_at(start)
+        self.goal = self.cell_at(goal)
+        self.walls = MappedWalls(self)
+        self.solution = None
+
+    def cell_at(self, position):
+        """Returns the (row, col) of a byte position in the file."""
+        row = bisect_right(self.offsets, position) - 1
+        return (row, position - self.offsets[row])
+
+    def neighbors(self, state):
+        row, col = state
+        buffer = self.map
+        candidates = [
+            ("up", (row - 1, col)),
+            ("down", (row + 1, col)),
+            ("left", (row, col - 1)),
+            ("right", (row, col + 1))
+        ]
+
+        result = []
+        for action, (r, c) in candidates:
+            if 0 <= r < self.height and 0 <= c < self.width:
+                if c >= self.lengths[r] or buffer[self.offsets[r] + c] in OPEN:
+                    result.append((action, (r, c)))
+        return result
+
+    @property
+    def grid(self):
+        """
+        The whole padded wall grid, as Maze keeps it. This reads the entire
+        file into memory, so it is only meant for printing and rendering
+        mazes that fit.
+        """
+        return bytearray(
+            0 if cell in OPEN else 1
+            for row in range(self.height)
+            for cell in self.map[self.offsets[row]:self.offsets[row] + self.lengths[row]].ljust(self.width)
+        )
+
+    def close(self):
+        self.map.close()
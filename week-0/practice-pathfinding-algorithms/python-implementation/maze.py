@@ -1,63 +1,97 @@
-from frontiers import StackFrontier, QueueFrontier
+import math
+import sys
+
+import compact_search
+import jps
+from frontiers import DequeStackFrontier, DequeQueueFrontier, PriorityFrontier
 from node import Node
 
+
+def manhattan(a, b):
+    """Number of 4-connected steps between cells a and b on an open grid."""
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def octile(a, b):
+    """Distance between cells a and b when diagonal steps cost sqrt(2)."""
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy)
+
+
+HEURISTICS = {
+    "manhattan": manhattan,
+    "octile": octile,
+}
+
+ALGORITHMS = ("bfs", "dfs", "greedy", "astar", "bidirectional", "jps")
+
+# Wall bytes of the grid as characters for Maze.print
+PRINT_TABLE = bytes(ord("#") if byte else ord(" ") for byte in range(256))
+
+# Palette indices and colors for Maze.output_image
+BORDER, WALL, START, GOAL, SOLUTION, EXPLORED, EMPTY = range(7)
+PALETTE = [
+    0, 0, 0,
+    40, 40, 40,
+    255, 0, 0,
+    0, 171, 28,
+    220, 235, 113,
+    212, 97, 85,
+    237, 240, 252,
+]
+IMAGE_TABLE = bytes(WALL if byte else EMPTY for byte in range(256))
+
+# Action that undoes each move, for walking a path built from the goal side
+OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+# Maps every byte of a maze file to 1 (wall) or 0 (open cell)
+WALL_TABLE = bytes(0 if chr(byte) in " AB" else 1 for byte in range(256))
+
+
 class Maze():
     def __init__(self, filename):
 
-        # Read file and set height and width of maze
+        # Read file as one byte per character; anything non-ASCII is a wall
         with open(filename) as f:
-            contents = f.read()
+            contents = f.read().encode("ascii", "replace")
 
         # Validate start and goal
-        if contents.count("A") != 1:
+        if contents.count(b"A") != 1:
             raise Exception("maze must have exactly one start point")
-        if contents.count("B") != 1:
+        if contents.count(b"B") != 1:
             raise Exception("maze must have exactly one goal")
 
         # Determine height and width of maze
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-
-        # Keep track of walls
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
+        lines = contents.splitlines()
+        self.height = len(lines)
+        self.width = max(len(line) for line in lines)
+
+        # Pad short rows with open cells and lay the maze out row-major,
+        # then turn every character into 1 (wall) or 0 (open) in one pass
+        cells = b"".join(line.ljust(self.width) for line in lines)
+        self.start = divmod(cells.index(b"A"), self.width)
+        self.goal = divmod(cells.index(b"B"), self.width)
+        self.grid = bytearray(cells.translate(WALL_TABLE))
+
+        # Keep track of walls, one zero-copy view per row of the grid
+        view = memoryview(self.grid)
+        self.walls = [view[i * self.width:(i + 1) * self.width] for i in range(self.height)]
 
         self.solution = None
 
     def print(self):
-        solution = self.solution[1] if self.solution is not None else None
-        print()
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col:
-                    print("█", end="")
-                elif (i, j) == self.start:
-                    print("A", end="")
-                elif (i, j) == self.goal:
-                    print("B", end="")
-                elif solution is not None and (i, j) in solution:
-                    print("*", end="")
-                else:
-                    print(" ", end="")
-            print()
-        print()
+        solution = self.solution[1] if self.solution is not None else []
+
+        # Lay out one character per cell, then overlay path, start and goal
+        chars = self.grid.translate(PRINT_TABLE)
+        for i, j in solution:
+            chars[i * self.width + j] = ord("*")
+        chars[self.start[0] * self.width + self.start[1]] = ord("A")
+        chars[self.goal[0] * self.width + self.goal[1]] = ord("B")
+
+        text = chars.decode("ascii").replace("#", "█")
+        rows = (text[i * self.width:(i + 1) * self.width] for i in range(self.height))
+        sys.stdout.write("\n" + "\n".join(rows) + "\n\n")
 
     def neighbors(self, state):
         row, col = state
@@ -74,77 +108,106 @@ class Maze():
                 result.append((action, (r, c)))
         return result
 
-    def output_image(self, filename, show_solution=True, show_explored=False):
+    def output_image(self, filename, show_solution=True, show_explored=False, cell_size=50, cell_border=2):
         from PIL import Image, ImageDraw
-        cell_size = 50
-        cell_border = 2
-
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
-
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
-
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
-
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
-
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
-
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
-
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
-
-                # Draw cell
-                draw.rectangle(
-                    (
-                        [
-                            (
-                                j * cell_size + cell_border,
-                                i * cell_size + cell_border
-                            ),
-                            (
-                                (j + 1) * cell_size - cell_border,
-                                (i + 1) * cell_size - cell_border
-                            )
-                        ]
-                    ),
-                    fill=fill
-                )
-
-        img.save(filename)
-
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+
+        # Paint one palette index per cell, lowest precedence first
+        cells = self.grid.translate(IMAGE_TABLE)
+        if self.solution is not None:
+            if show_explored:
+                for i, j in self.explored:
+                    cells[i * self.width + j] = EXPLORED
+            if show_solution:
+                for i, j in self.solution[1]:
+                    cells[i * self.width + j] = SOLUTION
+        cells[self.start[0] * self.width + self.start[1]] = START
+        cells[self.goal[0] * self.width + self.goal[1]] = GOAL
+
+        # Scale every cell up to cell_size in one go
+        img = Image.frombytes("P", (self.width, self.height), bytes(cells))
+        img.putpalette(PALETTE)
+        img = img.resize((self.width * cell_size, self.height * cell_size), Image.NEAREST)
+
+        # Black out the borders between cells, one stripe per grid line
+        if cell_border > 0:
+            draw = ImageDraw.Draw(img)
+            reach = cell_border - 1
+            for j in range(self.width + 1):
+                x = j * cell_size
+                draw.rectangle([(x - reach, 0), (x + reach, img.height)], fill=BORDER)
+            for i in range(self.height + 1):
+                y = i * cell_size
+                draw.rectangle([(0, y - reach), (img.width, y + reach)], fill=BORDER)
+
+        img.convert("RGBA").save(filename)
+
+    def frontier(self, algorithm, heuristic):
+        """Returns an empty frontier implementing the given search algorithm."""
+        if algorithm == "bfs":
+            return DequeQueueFrontier()
+        if algorithm == "dfs":
+            return DequeStackFrontier()
+
+        if heuristic not in HEURISTICS:
+            raise Exception(f"unknown heuristic: {heuristic}")
+        h = HEURISTICS[heuristic]
+        goal = self.goal
+
+        if algorithm == "greedy":
+            return PriorityFrontier(lambda node: h(node.state, goal))
+        if algorithm == "astar":
+            # Among equal f = g + h, prefer the node closest to the goal
+            def priority(node):
+                estimate = h(node.state, goal)
+                return (node.cost + estimate, estimate)
+            return PriorityFrontier(priority)
+
+        raise Exception(f"unknown algorithm: {algorithm}")
+
+    def solve(self, algorithm="bfs", heuristic="manhattan", compact=False, instrument=None):
+        """
+        Finds a solution to maze, if one exists.
+
+        algorithm is one of "bfs", "dfs", "greedy" (greedy best-first) or
+        "astar"; the informed searches are guided by heuristic, either
+        "manhattan" or "octile". "bidirectional" runs a breadth-first
+        search from both the start and the goal until they meet, and "jps"
+        runs Jump Point Search (A* over jump points only, see jps.py).
+
+        With compact=True, "bfs", "dfs" and "astar" run on flat per-cell
+        arrays instead of Node objects (see compact_search.py), which takes far
+        less memory on large mazes.
+
+        instrument, if given, is a SearchInstrumentation (see
+        instrumentation.py) that is told about every push, pop and
+        expansion.
+        """
+        if algorithm == "bidirectional":
+            return self.solve_bidirectional(instrument)
+        if algorithm == "jps":
+            self.solution, self.num_explored, self.explored = jps.solve(self, instrument)
+            return
+        if compact:
+            if heuristic not in HEURISTICS:
+                raise Exception(f"unknown heuristic: {heuristic}")
+            self.solution, self.num_explored, self.explored = compact_search.solve(
+                self, algorithm, HEURISTICS[heuristic], instrument
+            )
+            return
 
         # Keep track of number of states explored
         self.num_explored = 0
 
         # Initialize frontier to just the starting position
         start = Node(state=self.start, parent=None, action=None)
-        frontier = QueueFrontier()
+        frontier = self.frontier(algorithm, heuristic)
+        if instrument is not None:
+            frontier = instrument.frontier(frontier)
         frontier.add(start)
 
+        # A* may find a cheaper route to a state already in the frontier
+        reopen = algorithm == "astar"
+
         # Initialize an empty explored set
         self.explored = set()
 
@@ -174,9 +237,103 @@ class Maze():
 
             # Mark node as explored
             self.explored.add(node.state)
+            if instrument is not None:
+                instrument.expand(node.state)
 
             # Add neighbors to frontier
             for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
-                    frontier.add(child)
\ No newline at end of file
+                if state in self.explored:
+                    continue
+                if reopen or not frontier.contains_state(state):
+                    child = Node(state=state, parent=node, action=action, cost=node.cost + 1)
+                    frontier.add(child)
+
+    def solve_bidirectional(self, instrument=None):
+        """
+        Finds a shortest solution by breadth-first search from both ends,
+        always expanding one whole layer of the smaller frontier.
+        """
+
+        # Keep track of number of states explored
+        self.num_explored = 0
+        self.explored = set()
+
+        # Nodes reached from each end, keyed by state
+        forward = {self.start: Node(state=self.start, parent=None, action=None)}
+        backward = {self.goal: Node(state=self.goal, parent=None, action=None)}
+        forward_layer = [self.start]
+        backward_layer = [self.goal]
+
+        # Shortest link found between the two trees: (forward node, backward node, action)
+        link = None
+        if self.start == self.goal:
+            link = (forward[self.start], backward[self.goal], None)
+
+        while link is None:
+
+            # If either side runs dry, then no path
+            if not forward_layer or not backward_layer:
+                raise Exception("no solution")
+
+            # Grow whichever side has the smaller frontier
+            growing_forward = len(forward_layer) <= len(backward_layer)
+            if growing_forward:
+                nodes, others, layer = forward, backward, forward_layer
+            else:
+                nodes, others, layer = backward, forward, backward_layer
+
+            # Expand the whole layer, keeping the shortest link seen
+            next_layer = []
+            best = None
+            for state in layer:
+                node = nodes[state]
+                self.num_explored += 1
+                self.explored.add(state)
+                if instrument is not None:
+                    instrument.pop(state, len(forward_layer) + len(backward_layer) + len(next_layer))
+                    instrument.expand(state)
+                for action, neighbor in self.neighbors(state):
+                    if neighbor in others:
+                        length = node.cost + 1 + others[neighbor].cost
+                        if best is None or length < best:
+                            best = length
+                            if growing_forward:
+                                link = (node, others[neighbor], action)
+                            else:
+                                link = (others[neighbor], node, OPPOSITE[action])
+                    if neighbor not in nodes:
+                        nodes[neighbor] = Node(state=neighbor, parent=node, action=action, cost=node.cost + 1)
+                        next_layer.append(neighbor)
+                        if instrument is not None:
+                            size = len(forward_layer) + len(backward_layer) + len(next_layer)
+                            instrument.push(neighbor, size, nodes[neighbor])
+
+            if growing_forward:
+                forward_layer = next_layer
+            else:
+                backward_layer = next_layer
+
+        # Walk back from the forward end of the link to the start...
+        node, goal_side, action = link
+        actions = []
+        cells = []
+        while node.parent is not None:
+            actions.append(node.action)
+            cells.append(node.state)
+            node = node.parent
+        actions.reverse()
+        cells.reverse()
+
+        # ...cross the link...
+        if action is not None:
+            actions.append(action)
+            cells.append(goal_side.state)
+
+        # ...then on to the goal, undoing each move of the backward search
+        node = goal_side
+        while node.parent is not None:
+            actions.append(OPPOSITE[node.action])
+            cells.append(node.parent.state)
+            node = node.parent
+
+        self.solution = (actions, cells)
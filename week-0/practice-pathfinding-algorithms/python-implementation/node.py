@@ -1,5 +1,8 @@
 class Node():
-    def __init__(self, state, parent, action):
+    __slots__ = ("state", "parent", "action", "cost")
+
+    def __init__(self, state, parent, action, cost=0):
         self.state = state
         self.parent = parent
-        self.action = action
\ No newline at end of file
+        self.action = action
+        self.cost = cost
@@ -0,0 +1,111 @@
+"""
+Many-query path service over a single maze.
+
+A breadth-first distance field from a goal tells every cell how far it is
+from that goal, so once a field exists any start can walk straight down
+the gradient in O(path length). Fields are kept in a small LRU cache.
+"""
+
+from array import array
+from collections import OrderedDict, deque
+
+# Distance of cells that cannot reach the goal
+UNREACHABLE = -1
+
+
+class PathService():
+    def __init__(self, maze, cache_size=8):
+        self.maze = maze
+        self.cache_size = cache_size
+        self.fields = OrderedDict()
+
+    def distance_field(self, goal):
+        """
+        Returns an array of each cell's distance to goal, indexed by
+        row * width + col, computing and caching it if needed.
+        """
+        if goal in self.fields:
+            self.fields.move_to_end(goal)
+            return self.fields[goal]
+
+        field = self.compute_field(goal)
+        self.fields[goal] = field
+        if len(self.fields) > self.cache_size:
+            self.fields.popitem(last=False)  # Least recently used
+        return field
+
+    def compute_field(self, goal):
+        """Breadth-first search outwards from goal over cell ids."""
+        width = self.maze.width
+        grid = self.maze.grid
+        field = array("i", [UNREACHABLE]) * len(grid)
+
+        source = goal[0] * width + goal[1]
+        field[source] = 0
+        queue = deque([source])
+        while queue:
+            cell = queue.popleft()
+            distance = field[cell] + 1
+            col = cell % width
+            for neighbor, inside in (
+                (cell - width, cell >= width),
+                (cell + width, cell + width < len(grid)),
+                (cell - 1, col > 0),
+                (cell + 1, col < width - 1),
+            ):
+                if inside and not grid[neighbor] and field[neighbor] == UNREACHABLE:
+                    field[neighbor] = distance
+                    queue.append(neighbor)
+        return field
+
+    def query(self, start, goal):
+        """
+        Returns a shortest (actions, cells) solution from start to goal, in
+        the same format as Maze.solution, or None if goal is unreachable.
+        """
+        for cell in (start, goal):
+            if not self.is_open(cell):
+                raise Exception(f"{cell} is not an open cell")
+
+        field = self.distance_field(goal)
+        width = self.maze.width
+        if field[start[0] * width + start[1]] == UNREACHABLE:
+            return None
+
+        # Step to any neighbor one closer to the goal until we arrive
+        actions = []
+        cells = []
+        state = start
+        while state != goal:
+            distance = field[state[0] * width + state[1]]
+            for action, (r, c) in self.maze.neighbors(state):
+                if field[r * width + c] == distance - 1:
+                    actions.append(action)
+                    cells.append((r, c))
+                    state = (r, c)
+                    break
+        return actions, cells
+
+    def is_open(self, cell):
+        row, col = cell
+        return 0 <= row < self.maze.height and 0 <= col < self.maze.width and not self.maze.walls[row][col]
+
+
+def read_queries(filename):
+    """
+    Yields (line, start, goal) for each line "start_row start_col goal_row
+    goal_col" of a file, with start and goal as (row, col) pairs, or both
+    None if the line isn't four integers. Blank lines and lines starting
+    with # are skipped.
+    """
+    with open(filename) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                r1, c1, r2, c2 = (int(value) for value in line.split())
+            except ValueError:
+                yield line, None, None  # Malformed; let the caller report it
+                continue
+            yield line, (r1, c1), (r2, c2)
@@ -0,0 +1,318 @@
+"""
+Benchmarks for degrees.py on synthetic datasets.
+
+Usage: python benchmark.py [paths] [bidirectional] [adjacency] [batch] [names] [landmarks] [ingest] [components]
+"""
+
+import csv
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import degrees
+import ingest
+from components import Components
+from graph import StarGraph
+from landmarks import LandmarkOracle
+from names import NameIndex
+
+
+def synthetic_graph(people, movies, cast=(2, 8), scale_free=False, seed=0):
+    """
+    Returns a StarGraph of people and movies where every movie stars a
+    random cast of between cast[0] and cast[1] people.
+
+    Casts are drawn uniformly, or with scale_free by preferential
+    attachment: most roles go to someone picked in proportion to the roles
+    they already have, giving a few hub actors with huge filmographies.
+    """
+    rng = random.Random(seed)
+    person_rows = [(str(i), f"Person {i}", str(1900 + i % 100)) for i in range(people)]
+    movie_rows = [(str(i), f"Movie {i}", str(1950 + i % 70)) for i in range(movies)]
+
+    star_rows = []
+    roles = []
+    for movie in range(movies):
+        for _ in range(rng.randint(*cast)):
+            if scale_free and roles and rng.random() < 0.8:
+                person = rng.choice(roles)
+            else:
+                person = rng.randrange(people)
+            roles.append(person)
+            star_rows.append((str(person), str(movie)))
+    return StarGraph.build(person_rows, movie_rows, star_rows)
+
+
+def random_pairs(graph, count, seed=1):
+    """Returns count random (source, target) id pairs of people who starred in something."""
+    rng = random.Random(seed)
+    actors = [person for person in range(graph.person_count) if len(graph.movies_of(person))]
+    return [
+        (graph.person_ids[rng.choice(actors)], graph.person_ids[rng.choice(actors)])
+        for _ in range(count)
+    ]
+
+
+def time_queries(search, pairs):
+    """Runs search over pairs; returns (total seconds, worst seconds, path lengths)."""
+    total = worst = 0
+    lengths = []
+    for source, target in pairs:
+        start = time.perf_counter()
+        path = search(source, target)
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        worst = max(worst, elapsed)
+        lengths.append(None if path is None else len(path))
+    return total, worst, lengths
+
+
+def bench_paths():
+    """Times shortest_path between random people on growing synthetic graphs."""
+    print(f"{'people':>9} {'movies':>9} {'queries':>8} {'mean ms':>9} {'worst ms':>9} {'mean degrees':>13}")
+    for people in (10_000, 100_000, 400_000):
+        degrees.graph = synthetic_graph(people, people // 2)
+        pairs = random_pairs(degrees.graph, 20)
+        total, worst, lengths = time_queries(degrees.shortest_path, pairs)
+        found = [length for length in lengths if length is not None]
+        mean = sum(found) / len(found) if found else float("nan")
+        print(f"{people:>9} {people // 2:>9} {len(pairs):>8} {total / len(pairs) * 1000:9.1f} "
+              f"{worst * 1000:9.1f} {mean:13.2f}")
+
+
+def bench_bidirectional(people=1_000_000):
+    """Compares one-sided and bidirectional BFS on a scale-free synthetic graph."""
+    degrees.graph = synthetic_graph(people, people // 2, scale_free=True)
+    pairs = random_pairs(degrees.graph, 10)
+
+    print(f"{'search':>14} {'queries':>8} {'mean ms':>9} {'worst ms':>9}")
+    results = []
+    for name, bidirectional in (("one-sided", False), ("bidirectional", True)):
+        total, worst, lengths = time_queries(
+            lambda source, target: degrees.shortest_path(source, target, bidirectional=bidirectional), pairs
+        )
+        results.append(lengths)
+        print(f"{name:>14} {len(pairs):>8} {total / len(pairs) * 1000:9.1f} {worst * 1000:9.1f}")
+    if results[0] != results[1]:
+        print("Path lengths differ!")
+
+
+def bench_adjacency(people=200_000):
+    """Query times with and without the precomputed person-to-person index."""
+    graph = degrees.graph = synthetic_graph(people, people // 2, scale_free=True)
+    pairs = random_pairs(graph, 20)
+
+    print(f"{'neighbors':>10} {'build s':>8} {'index MB':>9} {'mean ms':>9} {'worst ms':>9}")
+    total, worst, _ = time_queries(degrees.shortest_path, pairs)
+    print(f"{'on the fly':>10} {'-':>8} {'-':>9} {total / len(pairs) * 1000:9.1f} {worst * 1000:9.1f}")
+
+    start = time.perf_counter()
+    graph.build_adjacency(max_bytes=1 << 30)
+    built = time.perf_counter() - start
+    size = sum(len(memoryview(values).cast("B"))
+               for values in (graph.adjacency_offsets, graph.adjacency_people, graph.adjacency_movies))
+    total, worst, _ = time_queries(degrees.shortest_path, pairs)
+    print(f"{'index':>10} {built:8.2f} {size / 2 ** 20:9.1f} {total / len(pairs) * 1000:9.1f} {worst * 1000:9.1f}")
+
+
+def bench_batch(people=200_000):
+    """Throughput of --batch mode with one worker vs. one per CPU."""
+    degrees.graph = synthetic_graph(people, people // 2, scale_free=True)
+    pairs = random_pairs(degrees.graph, 400)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "pairs.csv")
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["source", "target"])
+            writer.writerows(pairs)
+
+        print(f"{'workers':>8} {'pairs':>6} {'seconds':>8} {'pairs/s':>8}")
+        for workers in sorted({1, os.cpu_count()}):
+            with open(os.devnull, "w") as output:
+                start = time.perf_counter()
+                degrees.run_batch(directory, filename, output, workers, bidirectional=True)
+                elapsed = time.perf_counter() - start
+            print(f"{workers:>8} {len(pairs):>6} {elapsed:8.2f} {len(pairs) / elapsed:8.1f}")
+
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Emma",
+               "William", "Olivia", "Richard", "Sophia", "Joseph", "Isabella", "Thomas", "Mia", "Kevin", "Tom"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+              "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Bacon", "Hanks", "Watson"]
+
+
+def bench_names(people=1_000_000):
+    """Latency of exact, prefix and fuzzy name lookups over a large synthetic cast."""
+    rng = random.Random(0)
+    person_rows = [
+        (str(i), f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{rng.randrange(100_000)}", "")
+        for i in range(people)
+    ]
+    graph = StarGraph.build(person_rows, [], [])
+
+    start = time.perf_counter()
+    index = NameIndex(graph)
+    print(f"index built in {time.perf_counter() - start:.2f} s over {people} names")
+
+    queries = [graph.person_names[rng.randrange(people)] for _ in range(200)]
+    typos = [name[:3] + name[4:] for name in queries]
+    lookups = [
+        ("exact", lambda name: index.exact(name), queries),
+        ("prefix", lambda name: index.prefix(name[:8]), queries),
+        ("fuzzy d=1", lambda name: index.fuzzy(name, max_distance=1), typos),
+        ("fuzzy d=2", lambda name: index.fuzzy(name, max_distance=2), typos),
+    ]
+    print(f"{'lookup':>10} {'mean ms':>9} {'worst ms':>9}")
+    for name, lookup, inputs in lookups:
+        total, worst, _ = time_queries(lambda query, _: lookup(query), [(query, None) for query in inputs])
+        print(f"{name:>10} {total / len(inputs) * 1000:9.3f} {worst * 1000:9.3f}")
+
+
+def bench_landmarks(people=200_000, k=8):
+    """Landmark build time, bound latency and bound tightness, and A* vs. BFS query time."""
+    graph = degrees.graph = synthetic_graph(people, people // 2, scale_free=True)
+    pairs = random_pairs(graph, 20)
+
+    degrees.oracle = None
+    bfs_total, _, lengths = time_queries(degrees.shortest_path, pairs)
+
+    start = time.perf_counter()
+    degrees.oracle = LandmarkOracle.build(graph, k)
+    print(f"{k} landmarks built in {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    bounds = [degrees.separation_bounds(source, target) for source, target in pairs]
+    bounds_ms = (time.perf_counter() - start) / len(pairs) * 1000
+    exact = sum(lower == length == upper for (lower, upper), length in zip(bounds, lengths))
+    astar_total, _, _ = time_queries(degrees.shortest_path, pairs)
+
+    print(f"{'query':>8} {'mean ms':>9}")
+    print(f"{'bounds':>8} {bounds_ms:9.3f}   ({exact}/{len(pairs)} pairs pinned exactly)")
+    print(f"{'bfs':>8} {bfs_total / len(pairs) * 1000:9.1f}")
+    print(f"{'astar':>8} {astar_total / len(pairs) * 1000:9.1f}")
+    degrees.oracle = None
+
+
+def bench_components(people=500_000):
+    """Component labelling time, and "not connected" queries with and without the labels."""
+    graph = degrees.graph = synthetic_graph(people, people // 4, cast=(1, 4), scale_free=True)
+
+    start = time.perf_counter()
+    labels = Components.build(graph)
+    print(f"{len(labels)} components labelled in {time.perf_counter() - start:.2f} s, "
+          f"largest {labels.sizes[0]} of {people} people")
+
+    # Pairs from the giant component to people in other, smaller ones
+    rng = random.Random(0)
+    giant = [person for person in range(people) if labels.labels[person] == 0]
+    others = [person for person in range(people) if labels.labels[person] != 0]
+    pairs = [(graph.person_ids[rng.choice(giant)], graph.person_ids[rng.choice(others)]) for _ in range(5)]
+
+    print(f"{'query':>10} {'mean ms':>9}")
+    for name, value in (("search", None), ("labels", labels)):
+        degrees.components = value
+        total, _, lengths = time_queries(degrees.shortest_path, pairs)
+        assert all(length is None for length in lengths)
+        print(f"{name:>10} {total / len(pairs) * 1000:9.3f}")
+    degrees.components = None
+
+
+def write_csv(directory, people, movies, stars, seed=0):
+    """Writes people.csv, movies.csv and stars.csv shaped like the IMDb "large" set."""
+    rng = random.Random(seed)
+    with open(os.path.join(directory, "people.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "birth"])
+        writer.writerows((i, f"Person {i}", 1900 + i % 100 if i % 3 else "") for i in range(people))
+    with open(os.path.join(directory, "movies.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "title", "year"])
+        writer.writerows((i, f"Movie, {i}", 1950 + i % 70) for i in range(movies))
+
+    # A few stars name movies that are not in movies.csv, as in the real data
+    with open(os.path.join(directory, "stars.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["person_id", "movie_id"])
+        writer.writerows((rng.randrange(people), rng.randrange(movies + 50)) for _ in range(stars))
+
+
+def dictreader_load(directory):
+    """The original load_data: DictReader rows into dicts of sets."""
+    names, people, movies = {}, {}, {}
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            people[row["id"]] = {"name": row["name"], "birth": row["birth"], "movies": set()}
+            names.setdefault(row["name"].lower(), set()).add(row["id"])
+    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            movies[row["id"]] = {"title": row["title"], "year": row["year"], "stars": set()}
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                people[row["person_id"]]["movies"].add(row["movie_id"])
+                movies[row["movie_id"]]["stars"].add(row["person_id"])
+            except KeyError:
+                pass
+
+
+def bench_ingest(people=1_044_499, movies=344_276, stars=1_189_594):
+    """Parse time and peak memory of the CSV readers on IMDb-sized files, each in a fresh process."""
+    with tempfile.TemporaryDirectory() as directory:
+        write_csv(directory, people, movies, stars)
+        readers = ["dictreader", "csv"] + (["pandas"] if ingest.pandas is not None else [])
+        print(f"{'reader':>10} {'seconds':>8} {'peak MB':>8}")
+        for reader in readers:
+            output = subprocess.run(
+                [sys.executable, __file__, "--ingest", reader, directory],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            seconds, peak = output.split()
+            print(f"{reader:>10} {float(seconds):8.2f} {float(peak):8.0f}")
+
+
+def time_ingest(reader, directory):
+    """Runs one reader for bench_ingest; prints its seconds and peak resident MB."""
+    if reader == "pandas":
+        load = ingest.read_graph
+    elif reader == "csv":
+        ingest.pandas = None
+        load = ingest.read_graph
+    else:
+        load = dictreader_load
+    start = time.perf_counter()
+    load(directory)
+    elapsed = time.perf_counter() - start
+    print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+
+
+BENCHMARKS = {
+    "paths": bench_paths,
+    "bidirectional": bench_bidirectional,
+    "adjacency": bench_adjacency,
+    "batch": bench_batch,
+    "names": bench_names,
+    "landmarks": bench_landmarks,
+    "ingest": bench_ingest,
+    "components": bench_components,
+}
+
+
+def main():
+    if sys.argv[1:2] == ["--ingest"]:
+        time_ingest(*sys.argv[2:])
+        return
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            sys.exit(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+        print(f"== {name}")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
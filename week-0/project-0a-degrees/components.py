@@ -0,0 +1,101 @@
+"""
+Connected components of a StarGraph.
+
+Union-find over each movie's cast gives every person a component label,
+numbered from the largest component down, so two people in different
+components are known to be unconnected without searching at all.
+"""
+
+import json
+import os
+import struct
+from array import array
+from collections import Counter
+
+from graph import INDEX, OFFSET, replacing
+
+MAGIC = b"COMPONTS"
+
+
+class Components():
+    def __init__(self, labels, sizes):
+        self.labels = labels
+        self.sizes = sizes
+
+    @classmethod
+    def build(cls, graph):
+        """Labels everyone in graph by union-find over the stars of each movie."""
+        parents = array(INDEX, range(graph.person_count))
+
+        def find(person):
+            # Path halving: point every other person on the way at its grandparent
+            while parents[person] != person:
+                parents[person] = parents[parents[person]]
+                person = parents[person]
+            return person
+
+        for movie in range(graph.movie_count):
+            stars = graph.stars_of(movie)
+            if len(stars) > 1:
+                root = find(stars[0])
+                for star in stars[1:]:
+                    other = find(star)
+                    if other != root:
+                        parents[other] = root
+
+        # Number components by descending size, ties in order of first member
+        roots = [find(person) for person in range(graph.person_count)]
+        ranked = sorted(Counter(roots).items(), key=lambda item: -item[1])
+        numbering = {root: label for label, (root, _) in enumerate(ranked)}
+        return cls(array(INDEX, map(numbering.__getitem__, roots)), array(OFFSET, (size for _, size in ranked)))
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def connected(self, a, b):
+        """Returns whether person indices a and b are in the same component."""
+        return self.labels[a] == self.labels[b]
+
+    def size_of(self, person):
+        """Returns the number of people in person's component, person included."""
+        return self.sizes[self.labels[person]]
+
+    def save(self, filename, source=None):
+        header = json.dumps({"source": source, "people": len(self.labels), "components": len(self.sizes)}).encode()
+        with replacing(filename) as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            f.write(self.labels)
+            f.write(self.sizes)
+
+    @classmethod
+    def load(cls, filename, source=None):
+        """
+        Reads components written by save(); returns None if the file is
+        missing, truncated or corrupt, or was saved with a different source.
+        """
+        try:
+            with open(filename, "rb") as f:
+                file_size = os.fstat(f.fileno()).st_size
+                if f.read(len(MAGIC)) != MAGIC:
+                    return None
+                (length,) = struct.unpack("<Q", f.read(8))
+                if length > file_size:
+                    return None
+                header = json.loads(f.read(length))
+                if header["source"] != source:
+                    return None
+
+                # The arrays must fill the rest of the file exactly
+                labels = array(INDEX)
+                sizes = array(OFFSET)
+                people, count = header["people"], header["components"]
+                expected = len(MAGIC) + 8 + length + people * labels.itemsize + count * sizes.itemsize
+                if people < 0 or count < 0 or file_size != expected:
+                    return None
+                labels.fromfile(f, people)
+                sizes.fromfile(f, count)
+        except (OSError, ValueError, EOFError, struct.error, KeyError, TypeError):
+            return None
+        return cls(labels, sizes)
@@ -1,75 +1,181 @@
+import argparse
 import csv
+import heapq
+import math
+import multiprocessing
+import os
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
+from components import Components
+from graph import StarGraph
+from ingest import read_graph
+from landmarks import LandmarkOracle
+from names import NameIndex
+from util import Node, DequeQueueFrontier
 
-# Maps names to a set of corresponding person_ids
-names = {}
+# People, movies and who starred in what, as a StarGraph (see graph.py)
+graph = None
 
-# Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids)
-people = {}
+# Exact, prefix and fuzzy name lookups, built on first use (see names.py)
+names = None
 
-# Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
-movies = {}
+# Landmark distance oracle, if load_data was asked for one (see landmarks.py)
+oracle = None
 
+# Connected component of every person, once load_data has run (see components.py)
+components = None
 
-def load_data(directory):
+# Binary snapshot of the parsed graph, written next to the CSV files
+SNAPSHOT = "graph.cache"
+
+# Landmark distances and component labels, likewise
+LANDMARKS = "landmarks.cache"
+COMPONENTS = "components.cache"
+
+# Edits allowed when suggesting names: one keeps fuzzy lookups under a
+# millisecond over millions of names, two take a few (--max-edits 2)
+MAX_EDITS = 1
+
+
+def load_data(directory, cache=True, adjacency_limit=None, landmarks=None):
     """
     Load data from CSV files into memory.
+
+    With cache, the parsed graph is snapshotted to SNAPSHOT in directory
+    and later runs map that snapshot instead of parsing the CSV files,
+    for as long as the files' sizes and modification times match.
+
+    With adjacency_limit, a person-to-person index of up to that many
+    bytes is precomputed for the searches to use (see
+    StarGraph.build_adjacency); above it they expand movies on the fly.
+
+    Everyone's connected component is labelled too (or read from its
+    cache), so people in different components need no search.
+
+    With landmarks, a LandmarkOracle over that many landmark people is
+    built (or read from its cache) for bounds and A* guidance.
     """
-    # Load people
-    with open(f"{directory}/people.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            people[row["id"]] = {
-                "name": row["name"],
-                "birth": row["birth"],
-                "movies": set()
-            }
-            if row["name"].lower() not in names:
-                names[row["name"].lower()] = {row["id"]}
-            else:
-                names[row["name"].lower()].add(row["id"])
+    global graph, names, oracle, components
 
-    # Load movies
-    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            movies[row["id"]] = {
-                "title": row["title"],
-                "year": row["year"],
-                "stars": set()
-            }
-
-    # Load stars
-    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+    names = None
+    oracle = None
+    source = csv_signature(directory)
+    snapshot = os.path.join(directory, SNAPSHOT)
+    graph = StarGraph.load(snapshot, source) if cache else None
+
+    if graph is None:
+        graph = read_csv(directory)
+        if cache:
+            try:
+                graph.save(snapshot, source)
+            except OSError:
+                pass  # Read-only data directory, parse again next time
+
+    if adjacency_limit is not None:
+        graph.build_adjacency(adjacency_limit)
+
+    components_file = os.path.join(directory, COMPONENTS)
+    components = Components.load(components_file, source) if cache else None
+    if components is None:
+        components = Components.build(graph)
+        if cache:
             try:
-                people[row["person_id"]]["movies"].add(row["movie_id"])
-                movies[row["movie_id"]]["stars"].add(row["person_id"])
-            except KeyError:
+                components.save(components_file, source)
+            except OSError:
                 pass
 
+    if landmarks:
+        oracle_file = os.path.join(directory, LANDMARKS)
+        oracle = LandmarkOracle.load(oracle_file, source, landmarks) if cache else None
+        if oracle is None:
+            oracle = LandmarkOracle.build(graph, landmarks)
+            if cache:
+                try:
+                    oracle.save(oracle_file, source)
+                except OSError:
+                    pass
+
+
+def read_csv(directory):
+    """
+    Parses the CSV files in directory into a StarGraph (see ingest.py),
+    reporting any stars it had to skip on stderr.
+    """
+    dropped = []
+    graph = read_graph(directory, dropped)
+    if dropped:
+        print(f"Skipped {len(dropped)} star{'s' if len(dropped) != 1 else ''} naming an unknown person "
+              f"or movie, e.g. person {dropped[0][0]} in movie {dropped[0][1]}", file=sys.stderr)
+    return graph
+
+
+def csv_signature(directory):
+    """Returns the size and modification time of each CSV file in directory."""
+    signature = {}
+    for name in ("people.csv", "movies.csv", "stars.csv"):
+        stat = os.stat(os.path.join(directory, name))
+        signature[name] = [stat.st_size, stat.st_mtime_ns]
+    return signature
+
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    parser = argparse.ArgumentParser(description="Find the degrees of separation between two people.")
+    parser.add_argument("directory", nargs="?", default="large", help="data directory (default: large)")
+    parser.add_argument("--batch", metavar="PAIRS_CSV",
+                        help="answer every source,target pair of person ids or names in PAIRS_CSV")
+    parser.add_argument("--histogram", metavar="PERSON_ID",
+                        help="count how many people are each number of degrees from PERSON_ID")
+    parser.add_argument("--suggest", metavar="NAME", help="list people whose name starts with or is close to NAME")
+    parser.add_argument("--components", action="store_true", help="summarize the connected components and exit")
+    parser.add_argument("--max-edits", type=int, default=MAX_EDITS, metavar="N",
+                        help=f"suggest names up to N typos away (default: {MAX_EDITS})")
+    parser.add_argument("--output", metavar="CSV", help="write batch or histogram results here instead of stdout")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="batch worker processes")
+    parser.add_argument("--bidirectional", action="store_true", help="search from both people at once")
+    parser.add_argument("--adjacency-mb", type=int, metavar="MB",
+                        help="precompute a person-to-person index of at most MB megabytes")
+    parser.add_argument("--landmarks", type=int, metavar="K",
+                        help="precompute distances from K landmark people to bound and guide searches")
+    args = parser.parse_args()
+    adjacency_limit = args.adjacency_mb * 2 ** 20 if args.adjacency_mb is not None else None
+    options = {"adjacency_limit": adjacency_limit, "landmarks": args.landmarks}
+
+    if args.suggest:
+        load_data(args.directory, **options)
+        print_suggestions(args.suggest, args.max_edits)
+        return
+
+    if args.components:
+        load_data(args.directory, **options)
+        print_components()
+        return
+
+    if args.batch or args.histogram:
+        load_data(args.directory, **options)
+        output = open(args.output, "w", newline="") if args.output else sys.stdout
+        try:
+            if args.batch:
+                run_batch(args.directory, args.batch, output, args.workers, args.bidirectional, options)
+            else:
+                write_histogram(args.histogram, output)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        return
 
     # Load data from files into memory
     print("Loading data...")
-    load_data(directory)
+    load_data(args.directory, **options)
     print("Data loaded.")
 
-    source = person_id_for_name(input("Name: "))
+    source = person_id_for_name(input("Name: "), args.max_edits)
     if source is None:
         sys.exit("Person not found.")
-    target = person_id_for_name(input("Name: "))
+    target = person_id_for_name(input("Name: "), args.max_edits)
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    path = shortest_path(source, target, bidirectional=args.bidirectional)
 
     if path is None:
         print("Not connected.")
@@ -78,22 +184,186 @@ def main():
         print(f"{degrees} degrees of separation.")
         path = [(None, source)] + path
         for i in range(degrees):
-            person1 = people[path[i][1]]["name"]
-            person2 = people[path[i + 1][1]]["name"]
-            movie = movies[path[i + 1][0]]["title"]
+            person1 = graph.person_names[graph.person_index(path[i][1])]
+            person2 = graph.person_names[graph.person_index(path[i + 1][1])]
+            movie = graph.movie_titles[graph.movie_index(path[i + 1][0])]
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def print_suggestions(name, max_edits=MAX_EDITS):
+    """
+    Prints people whose name starts with name, then those within max_edits
+    edits.
+    """
+    index = name_index()
+    for person in index.prefix(name):
+        print(f"{graph.person_ids[person]}: {graph.person_names[person]} ({graph.person_births[person]})")
+    for distance, person in index.fuzzy(name, max_distance=max_edits):
+        print(f"{graph.person_ids[person]}: {graph.person_names[person]} ({graph.person_births[person]}), "
+              f"{distance} edit{'s' if distance != 1 else ''} away")
+
+
+def print_components(top=10):
+    """
+    Prints how many connected components there are, how many people are
+    on their own, and the sizes of the top largest components.
+    """
+    sizes = components.sizes
+    alone = sum(1 for size in sizes if size == 1)
+    print(f"{len(sizes)} component{'s' if len(sizes) != 1 else ''} among {graph.person_count} people")
+    print(f"{alone} {'person has' if alone == 1 else 'people have'} no co-stars")
+    for label, size in enumerate(sizes[:top]):
+        if size == 1:
+            break
+        print(f"{label + 1}: {size} people ({size / graph.person_count:.1%})")
+
+
+def run_batch(directory, pairs_file, output, workers, bidirectional=False, options=None):
+    """
+    Answers every (source, target) pair in pairs_file across a pool of
+    worker processes, streaming "source,target,status,degrees,path" CSV
+    rows to output in input order. status is "ok", "not_connected", or
+    for the first identifier that doesn't name exactly one person,
+    "unknown_source", "ambiguous_source", "unknown_target" or
+    "ambiguous_target"; degrees and path are empty unless it is "ok".
+    The path is written as movie_id:person_id steps joined by ";".
+    """
+    writer = csv.writer(output)
+    writer.writerow(["source", "target", "status", "degrees", "path"])
+
+    # Forked workers inherit the loaded graph; spawned ones load their own
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+    with context.Pool(workers, initializer=init_worker, initargs=(directory, options or {})) as pool:
+        queries = ((source, target, bidirectional) for source, target in read_pairs(pairs_file))
+        for source, target, status, path in pool.imap(answer_pair, queries, chunksize=16):
+            if path is None:
+                writer.writerow([source, target, status, "", ""])
+            else:
+                steps = ";".join(f"{movie_id}:{person_id}" for movie_id, person_id in path)
+                writer.writerow([source, target, status, len(path), steps])
+            output.flush()
+
+
+def read_pairs(filename):
+    """
+    Yields (source, target) pairs from a CSV file with "source" and
+    "target" columns, each holding a person id or an unambiguous name.
+    """
+    with open(filename, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield row["source"].strip(), row["target"].strip()
+
+
+def init_worker(directory, options):
+    if graph is None:
+        load_data(directory, **options)
+
+
+def answer_pair(query):
+    """
+    Worker side of run_batch: returns (source, target, status, path),
+    with status as described there and path None unless it is "ok".
+    """
+    source, target, bidirectional = query
+    source_id, problem = resolve_identifier(source)
+    if problem is not None:
+        return source, target, f"{problem}_source", None
+    target_id, problem = resolve_identifier(target)
+    if problem is not None:
+        return source, target, f"{problem}_target", None
+
+    path = shortest_path(source_id, target_id, bidirectional=bidirectional)
+    return source, target, "ok" if path is not None else "not_connected", path
+
+
+def resolve_identifier(identifier):
+    """
+    Returns (person_id, None) if identifier is a known person id or the
+    name of exactly one person, else (None, "unknown") or (None,
+    "ambiguous").
+    """
+    if graph.person_index(identifier) is not None:
+        return identifier, None
+    candidates = person_candidates(identifier)
+    if len(candidates) == 1:
+        return candidates[0][0], None
+    return None, "ambiguous" if candidates else "unknown"
+
+
+def write_histogram(source, output):
+    """
+    Writes "degrees,people" CSV rows counting everyone by their distance
+    from source, followed by the number of people not connected at all.
+    """
+    person = graph.person_index(source)
+    if person is None:
+        sys.exit("Person not found.")
+
+    counts = distance_histogram(person)
+    writer = csv.writer(output)
+    writer.writerow(["degrees", "people"])
+    for degrees, count in enumerate(counts):
+        writer.writerow([degrees, count])
+    writer.writerow(["unreachable", graph.person_count - sum(counts)])
+
+
+def distance_histogram(source):
+    """
+    Breadth-first search from the source person index over the whole
+    graph; returns a list whose item d is the number of people d degrees
+    away (the source itself counting as 0).
+    """
+    seen = bytearray(graph.person_count)
+    seen[source] = 1
+    layer = [source]
+    counts = []
+    while layer:
+        counts.append(len(layer))
+        next_layer = []
+        for person in layer:
+            for _, neighbor in graph.adjacent(person):
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
+                    next_layer.append(neighbor)
+        layer = next_layer
+    return counts
+
+
+def shortest_path(source, target, bidirectional=False):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
     If no possible path, returns None.
+
+    With bidirectional, searches outwards from both people at once,
+    which touches far fewer people on densely connected graphs.
+    Otherwise, if a landmark oracle is loaded, runs A* guided by it.
+    """
+    source, target = graph.person_index(source), graph.person_index(target)
+    if components is not None and not components.connected(source, target):
+        return None
+
+    if bidirectional:
+        path = bidirectional_index_path(source, target)
+    elif oracle is not None:
+        path = landmark_index_path(source, target)
+    else:
+        path = shortest_index_path(source, target)
+    if path is None:
+        return None
+    return [(graph.movie_ids[movie], graph.person_ids[person]) for movie, person in path]
+
+
+def shortest_index_path(source, target):
+    """
+    shortest_path over person and movie indices of the graph: returns
+    the shortest list of (movie, person) index pairs, or None.
     """
 
-    # create a blank QueueFrontier (for BFS) and an empty set
-    frontier: QueueFrontier = QueueFrontier()
+    # create a blank queue frontier (for BFS) and an empty set
+    frontier: DequeQueueFrontier = DequeQueueFrontier()
     explored: set = set()
 
     # Add root node of the source, we use nodes
@@ -112,52 +382,188 @@ def shortest_path(source, target):
 
         # check if we have found the target
         if current.state == target:
-            # rebuild the path
-            path = []
-
-            while current.parent is not None:
-                # append (MOVIE_ID, PERSON_ID) tuple from left (no need to reverse when finished)
-                path.insert(0, (current.action, current.state))
-                current = current.parent
-
-            return path
+            return build_path(current)
 
         # if not found, mark current as explored and register it's successors
         explored.add(current.state)
 
-        for neighbor_movie_id, neighbor_id in neighbors_for_person(current.state):
+        for neighbor_movie, neighbor in graph.adjacent(current.state):
             # For optimization, we catch the target directly here and doing the same
             # job as we done above on building the path
-            if neighbor_id == target:
-                current = Node(neighbor_id, current, neighbor_movie_id)
-                path = []
-
-                while current.parent is not None:
-                    path.insert(0, (current.action, current.state))
-                    current = current.parent
-
-                return path
+            if neighbor == target:
+                return build_path(Node(neighbor, current, neighbor_movie))
 
             # If the neighbor is non-explored or pending in a frontier, discard it.
-            if (not frontier.contains_state(neighbor_id)) and (neighbor_id not in explored):
-                successor = Node(neighbor_id, current, neighbor_movie_id)
+            if (not frontier.contains_state(neighbor)) and (neighbor not in explored):
+                successor = Node(neighbor, current, neighbor_movie)
                 frontier.add(successor)
 
 
-def person_id_for_name(name):
+def separation_bounds(source, target):
+    """
+    Returns instant (lower, upper) bounds on the degrees of separation
+    between two person ids from the landmark oracle, where upper may be
+    math.inf, and lower is math.inf if they are provably not connected.
+    """
+    if oracle is None:
+        raise Exception("load_data was not asked for landmarks")
+    return oracle.bounds(graph.person_index(source), graph.person_index(target))
+
+
+def landmark_index_path(source, target):
+    """
+    shortest_index_path guided by the landmark oracle.
+
+    The best landmark gives a path of the upper-bound length straight
+    away; if that meets the lower bound it is returned as is. Otherwise
+    A*, with the landmark lower bound as its heuristic, only looks for a
+    strictly shorter path, pruning anyone who cannot lead to one.
+    """
+    lower, upper = oracle.bounds(source, target)
+    if lower == math.inf:
+        return None
+    if source == target:
+        return []
+
+    best = None
+    if upper != math.inf:
+        best = oracle.path(graph, source, target)
+        if len(best) == lower:
+            return best
+    limit = len(best) if best is not None else math.inf
+
+    # Maps each reached person to (parent person, movie) and their distance
+    parents = {source: (None, None)}
+    costs = {source: 0}
+
+    # Among equal estimates, expand the deepest person first
+    frontier = [(oracle.heuristic(source, target), 0, source)]
+
+    while frontier:
+        _, depth, person = heapq.heappop(frontier)
+        cost = -depth
+        if cost > costs[person]:
+            continue  # Reached more cheaply since this was queued
+
+        if person == target:
+            path = []
+            while parents[person][0] is not None:
+                parent, movie = parents[person]
+                path.append((movie, person))
+                person = parent
+            path.reverse()
+            return path
+
+        cost += 1
+        for movie, neighbor in graph.adjacent(person):
+            if cost < costs.get(neighbor, math.inf):
+                estimate = cost + oracle.heuristic(neighbor, target)
+                if estimate >= limit:
+                    continue  # Cannot beat the landmark path
+                costs[neighbor] = cost
+                parents[neighbor] = (person, movie)
+                heapq.heappush(frontier, (estimate, -cost, neighbor))
+
+    # Nothing shorter exists
+    return best
+
+
+def bidirectional_index_path(source, target):
+    """
+    shortest_index_path by breadth-first search from both ends, always
+    expanding one whole layer of whichever frontier is smaller.
+    """
+    if source == target:
+        return []
+
+    # Maps each reached person to (parent person, movie, depth)
+    forward = {source: (None, None, 0)}
+    backward = {target: (None, None, 0)}
+    forward_layer = [source]
+    backward_layer = [target]
+
+    # Shortest link found between the two trees: (forward person, movie, backward person)
+    link = None
+    while link is None:
+        if not forward_layer or not backward_layer:
+            return None  # Not connected
+
+        growing_forward = len(forward_layer) <= len(backward_layer)
+        if growing_forward:
+            reached, others, layer = forward, backward, forward_layer
+        else:
+            reached, others, layer = backward, forward, backward_layer
+
+        # Expand the whole layer, keeping the shortest link seen
+        next_layer = []
+        best = None
+        for person in layer:
+            depth = reached[person][2] + 1
+            for movie, neighbor in graph.adjacent(person):
+                if neighbor in others:
+                    length = depth + others[neighbor][2]
+                    if best is None or length < best:
+                        best = length
+                        link = (person, movie, neighbor) if growing_forward else (neighbor, movie, person)
+                if neighbor not in reached:
+                    reached[neighbor] = (person, movie, depth)
+                    next_layer.append(neighbor)
+
+        if growing_forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+
+    # Walk back from the forward end of the link to the source...
+    person, movie, other = link
+    path = []
+    while forward[person][0] is not None:
+        parent, parent_movie, _ = forward[person]
+        path.append((parent_movie, person))
+        person = parent
+    path.reverse()
+
+    # ...then across the link and on to the target
+    path.append((movie, other))
+    while backward[other][0] is not None:
+        parent, parent_movie, _ = backward[other]
+        path.append((parent_movie, parent))
+        other = parent
+    return path
+
+
+def build_path(node):
+    """
+    Returns the (action, state) pairs leading from the root to node.
+    """
+    path = []
+    while node.parent is not None:
+        path.append((node.action, node.state))
+        node = node.parent
+
+    # pairs were collected from the target backwards
+    path.reverse()
+    return path
+
+
+def person_id_for_name(name, max_edits=MAX_EDITS):
     """
     Returns the IMDB id for a person's name,
-    resolving ambiguities as needed.
+    resolving ambiguities as needed, and
+    suggesting names up to max_edits edits away.
     """
-    person_ids = list(names.get(name.lower(), set()))
+    people = name_index().exact(name)
+    person_ids = [graph.person_ids[person] for person in people]
     if len(person_ids) == 0:
+        suggestions = [graph.person_names[person] for _, person in name_index().fuzzy(name, max_distance=max_edits, limit=5)]
+        if suggestions:
+            print(f"Did you mean: {', '.join(suggestions)}?")
         return None
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
-        for person_id in person_ids:
-            person = people[person_id]
-            name = person["name"]
-            birth = person["birth"]
+        for person, person_id in zip(people, person_ids):
+            name = graph.person_names[person]
+            birth = graph.person_births[person]
             print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
         try:
             person_id = input("Intended Person ID: ")
@@ -170,16 +576,48 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def name_index():
+    """
+    Returns the NameIndex for the loaded graph, building it on first use.
+    """
+    global names
+    if names is None:
+        names = NameIndex(graph)
+    return names
+
+
+def person_candidates(name):
+    """
+    Returns (person_id, name, birth) for everyone whose name matches
+    exactly, ignoring case, without prompting.
+    """
+    return [
+        (graph.person_ids[person], graph.person_names[person], graph.person_births[person])
+        for person in name_index().exact(name)
+    ]
+
+
+def resolve_person(name, birth=None):
+    """
+    Non-interactive person_id_for_name: returns the IMDB id of the only
+    person with that name (and birth year, if given), or None if there
+    is no such person or the name is still ambiguous.
+    """
+    candidates = [
+        person_id for person_id, _, person_birth in person_candidates(name)
+        if birth is None or person_birth == str(birth)
+    ]
+    return candidates[0] if len(candidates) == 1 else None
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
-    movie_ids = people[person_id]["movies"]
     neighbors = set()
-    for movie_id in movie_ids:
-        for person_id in movies[movie_id]["stars"]:
-            neighbors.add((movie_id, person_id))
+    for movie, person in graph.neighbors(graph.person_index(person_id)):
+        neighbors.add((graph.movie_ids[movie], graph.person_ids[person]))
     return neighbors
 
 
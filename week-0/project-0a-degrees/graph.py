@@ -0,0 +1,360 @@
+"""
+Compact in-memory store of the people/movies/stars dataset.
+
+People and movies are interned to dense integer indices in file order.
+The bipartite "starred in" graph is kept twice in CSR (compressed sparse
+row) form: for person p, the movies they starred in are
+person_movies[person_offsets[p]:person_offsets[p + 1]], and likewise
+movie_stars/movie_offsets for the people in each movie. Strings live in
+StringTables, and id and name lookups bisect through sorted index
+arrays, so no per-person dicts or sets are kept.
+
+Optionally, build_adjacency() also precomputes a person-to-person CSR
+index holding each co-star once, with one movie connecting them, so
+searches stop re-expanding hub actors' filmographies on every visit.
+"""
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from itertools import accumulate, repeat
+from operator import add, mul
+
+# Typecodes for index arrays and offset arrays
+INDEX = "i"
+OFFSET = "q"
+
+# Snapshot file layout: magic, header length, JSON header, then sections
+MAGIC = b"STARGRPH"
+VERSION = 1
+STRING_TABLES = ("person_ids", "person_names", "person_births", "movie_ids", "movie_titles", "movie_years")
+ARRAYS = ("person_offsets", "person_movies", "movie_offsets", "movie_stars", "person_order", "movie_order", "name_order")
+
+
+class StringTable():
+    """Sequence of strings packed into one UTF-8 blob plus an offsets array."""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings):
+        joined = "".join(strings)
+        if joined.isascii():
+            # One byte per character, so no need to encode strings one by one
+            return cls(joined.encode("ascii"), array(OFFSET, accumulate(map(len, strings), initial=0)))
+        encoded = list(map(str.encode, strings))
+        return cls(b"".join(encoded), array(OFFSET, accumulate(map(len, encoded), initial=0)))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+
+def csr(sources, targets, count):
+    """
+    Builds (offsets, targets) arrays from parallel lists of sources and
+    targets sorted by source, for sources numbered 0 to count - 1.
+    """
+    counts = Counter(sources)
+    offsets = array(OFFSET, accumulate(map(counts.get, range(count), repeat(0)), initial=0))
+    return offsets, array(INDEX, targets)
+
+
+def sorted_order(strings, key=None):
+    """Returns the indices of a list of strings sorted by (key of) the strings."""
+    if key is not None:
+        strings = list(map(key, strings))
+    return array(INDEX, sorted(range(len(strings)), key=strings.__getitem__))
+
+
+class StarGraph():
+    def __init__(self, person_ids, person_names, person_births,
+                 movie_ids, movie_titles, movie_years,
+                 person_offsets, person_movies, movie_offsets, movie_stars,
+                 person_order, movie_order, name_order):
+        self.person_ids = person_ids
+        self.person_names = person_names
+        self.person_births = person_births
+        self.movie_ids = movie_ids
+        self.movie_titles = movie_titles
+        self.movie_years = movie_years
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_stars = movie_stars
+        self.person_order = person_order
+        self.movie_order = movie_order
+        self.name_order = name_order
+
+        # Person-to-person index, see build_adjacency
+        self.adjacency_offsets = None
+        self.adjacency_people = None
+        self.adjacency_movies = None
+
+    @classmethod
+    def build(cls, people, movies, stars, dropped=None):
+        """
+        Builds a graph from (id, name, birth) people, (id, title, year)
+        movies and (person_id, movie_id) stars; see from_columns.
+        """
+        stars = list(stars)
+        return cls.from_columns(
+            tuple(map(list, zip(*people))) if people else ([], [], []),
+            tuple(map(list, zip(*movies))) if movies else ([], [], []),
+            [([star[0] for star in stars], [star[1] for star in stars])],
+            dropped,
+        )
+
+    @classmethod
+    def from_columns(cls, people, movies, stars, dropped=None):
+        """
+        Builds a graph from (ids, names, births) people columns, (ids,
+        titles, years) movie columns and an iterable of (person_ids,
+        movie_ids) chunks of star columns, consumed one chunk at a time.
+        Stars naming an unknown person or movie are skipped, and appended
+        to dropped if it is given; duplicates are merged.
+        """
+        person_ids = people[0]
+        movie_ids = movies[0]
+        person_count = len(person_ids)
+        movie_count = len(movie_ids)
+
+        # Intern ids to indices just for the duration of the build
+        person_index = dict(zip(person_ids, range(person_count)))
+        movie_index = dict(zip(movie_ids, range(movie_count)))
+
+        # Each (person, movie) pair is kept as one int, person * movie_count + movie
+        pairs = set()
+        for star_people, star_movies in stars:
+            persons = list(map(person_index.get, star_people))
+            films = list(map(movie_index.get, star_movies))
+            if None in persons or None in films:
+                known = [i for i in range(len(persons)) if persons[i] is not None and films[i] is not None]
+                if dropped is not None:
+                    dropped.extend(
+                        (star_people[i], star_movies[i]) for i in range(len(persons))
+                        if persons[i] is None or films[i] is None
+                    )
+                persons = [persons[i] for i in known]
+                films = [films[i] for i in known]
+            pairs.update(map(add, map(mul, persons, repeat(movie_count)), films))
+        del person_index, movie_index
+
+        # Split the sorted pairs back up, then re-sort them by movie
+        by_person = sorted(pairs)
+        del pairs
+        persons, films = zip(*map(divmod, by_person, repeat(movie_count))) if by_person else ((), ())
+        del by_person
+        person_offsets, person_movies = csr(persons, films, person_count)
+        by_movie = sorted(map(add, map(mul, films, repeat(person_count)), persons))
+        del persons, films
+        films, persons = zip(*map(divmod, by_movie, repeat(person_count))) if by_movie else ((), ())
+        del by_movie
+        movie_offsets, movie_stars = csr(films, persons, movie_count)
+        del films, persons
+
+        return cls.from_arrays(people, movies, person_offsets, person_movies, movie_offsets, movie_stars)
+
+    @classmethod
+    def from_arrays(cls, people, movies, person_offsets, person_movies, movie_offsets, movie_stars):
+        """
+        Builds a graph from people and movie columns as for from_columns,
+        and both CSR halves of the graph, ready made.
+        """
+        person_ids, person_names, person_births = people
+        movie_ids, movie_titles, movie_years = movies
+        return cls(
+            StringTable.from_strings(person_ids), StringTable.from_strings(person_names),
+            StringTable.from_strings(person_births),
+            StringTable.from_strings(movie_ids), StringTable.from_strings(movie_titles),
+            StringTable.from_strings(movie_years),
+            person_offsets, person_movies, movie_offsets, movie_stars,
+            sorted_order(person_ids), sorted_order(movie_ids), sorted_order(person_names, key=str.lower),
+        )
+
+    @property
+    def person_count(self):
+        return len(self.person_ids)
+
+    @property
+    def movie_count(self):
+        return len(self.movie_ids)
+
+    def person_index(self, person_id):
+        """Returns the index of the person with the given IMDb id, or None."""
+        return lookup(self.person_ids, self.person_order, person_id)
+
+    def movie_index(self, movie_id):
+        """Returns the index of the movie with the given IMDb id, or None."""
+        return lookup(self.movie_ids, self.movie_order, movie_id)
+
+    def movies_of(self, person):
+        """Returns the indices of the movies a person starred in."""
+        return self.person_movies[self.person_offsets[person]:self.person_offsets[person + 1]]
+
+    def stars_of(self, movie):
+        """Returns the indices of the people who starred in a movie."""
+        return self.movie_stars[self.movie_offsets[movie]:self.movie_offsets[movie + 1]]
+
+    def neighbors(self, person):
+        """Yields (movie, person) index pairs for everyone who starred with person."""
+        movie_offsets = self.movie_offsets
+        movie_stars = self.movie_stars
+        for movie in self.movies_of(person):
+            for i in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                yield movie, movie_stars[i]
+
+    def build_adjacency(self, max_bytes):
+        """
+        Precomputes every person's distinct co-stars, each with one movie
+        they share. Gives up, leaving the graph without the index, once it
+        would take more than max_bytes; returns whether it was built.
+        """
+        entry_size = array(INDEX).itemsize * 2
+        offsets = array(OFFSET, [0])
+        people = array(INDEX)
+        movies = array(INDEX)
+
+        # The offsets array ends up with one entry per person plus one
+        offsets_size = (self.person_count + 1) * offsets.itemsize
+        for person in range(self.person_count):
+            costars = {}
+            for movie, costar in self.neighbors(person):
+                if costar != person and costar not in costars:
+                    costars[costar] = movie
+            if offsets_size + (len(people) + len(costars)) * entry_size > max_bytes:
+                return False
+            people.extend(costars.keys())
+            movies.extend(costars.values())
+            offsets.append(len(people))
+
+        self.adjacency_offsets = offsets
+        self.adjacency_people = people
+        self.adjacency_movies = movies
+        return True
+
+    def adjacent(self, person):
+        """
+        Yields (movie, person) index pairs for person's co-stars, once per
+        co-star if the adjacency index is built, otherwise as neighbors().
+        """
+        if self.adjacency_offsets is None:
+            yield from self.neighbors(person)
+            return
+        start = self.adjacency_offsets[person]
+        end = self.adjacency_offsets[person + 1]
+        yield from zip(self.adjacency_movies[start:end], self.adjacency_people[start:end])
+
+    def save(self, filename, source=None):
+        """
+        Writes the graph to a binary snapshot that load() can map back in.
+        source is stored in the header so callers can tell whether the
+        snapshot is still current.
+        """
+        sections = []
+        for name in STRING_TABLES:
+            table = getattr(self, name)
+            sections.append((f"{name}.blob", "B", table.blob))
+            sections.append((f"{name}.offsets", memoryview(table.offsets).format, table.offsets))
+        for name in ARRAYS:
+            values = getattr(self, name)
+            sections.append((name, memoryview(values).format, values))
+
+        # Lay sections out back to back, each aligned to 8 bytes
+        directory = {}
+        position = 0
+        for name, typecode, values in sections:
+            size = len(memoryview(values).cast("B"))
+            directory[name] = [typecode, position, size]
+            position += size + (-size % 8)
+
+        header = json.dumps({"version": VERSION, "source": source, "sections": directory}).encode()
+        header += b" " * (-(len(MAGIC) + 8 + len(header)) % 8)
+        with replacing(filename) as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for name, typecode, values in sections:
+                data = memoryview(values).cast("B")
+                f.write(data)
+                f.write(b"\0" * (-len(data) % 8))
+
+    @classmethod
+    def load(cls, filename, source=None):
+        """
+        Maps a snapshot written by save() and returns the graph, whose
+        arrays are zero-copy views into the mapping. Returns None if the
+        file is missing, truncated or corrupt, or was saved with a
+        different source.
+        """
+        try:
+            with open(filename, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            if buffer[:len(MAGIC)] != MAGIC:
+                return None
+            start = len(MAGIC) + 8
+            (length,) = struct.unpack("<Q", buffer[len(MAGIC):start])
+            header = json.loads(buffer[start:start + length])
+            if header["version"] != VERSION or header["source"] != source:
+                return None
+
+            view = memoryview(buffer)[start + length:]
+
+            def section(name):
+                typecode, offset, size = header["sections"][name]
+                if not 0 <= offset <= offset + size <= len(view):
+                    raise ValueError(f"Section {name} runs past the end of {filename}")
+                return view[offset:offset + size].cast(typecode)
+
+            tables = [StringTable(section(f"{name}.blob"), section(f"{name}.offsets")) for name in STRING_TABLES]
+            graph = cls(*tables, *(section(name) for name in ARRAYS))
+        except (struct.error, ValueError, TypeError, KeyError):
+            return None  # Not a snapshot save() finished writing; rebuild it
+
+        # Every offsets array must cover its sequence exactly
+        if any(len(table.offsets) == 0 or table.offsets[-1] != len(table.blob) for table in tables):
+            return None
+        if (len(graph.person_offsets) != graph.person_count + 1
+                or graph.person_offsets[-1] != len(graph.person_movies)
+                or len(graph.movie_offsets) != graph.movie_count + 1
+                or graph.movie_offsets[-1] != len(graph.movie_stars)):
+            return None
+        return graph
+
+
+@contextmanager
+def replacing(filename):
+    """
+    Opens a temporary file to write filename's new contents to, and moves
+    it into place only once the with block completes, so readers never
+    see a half-written file.
+    """
+    temporary = f"{filename}.tmp"
+    try:
+        with open(temporary, "wb") as f:
+            yield f
+        os.replace(temporary, filename)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def lookup(table, order, string):
+    """Bisects order, a sorted permutation of table, for string; returns its index or None."""
+    position = bisect_left(order, string, key=table.__getitem__)
+    if position < len(order) and table[order[position]] == string:
+        return order[position]
+    return None
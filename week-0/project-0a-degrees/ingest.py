@@ -0,0 +1,197 @@
+"""
+Readers turning the people/movies/stars CSV files into a StarGraph.
+
+Stars are streamed CHUNK_ROWS rows at a time, so only their interned
+(person, movie) pairs are ever held whole. If pandas is installed, its C
+parser reads the files and numpy does the interning, deduplication and
+sorting; otherwise csv.reader and StarGraph.from_columns do.
+"""
+
+import csv
+import functools
+import gc
+from array import array
+from itertools import islice, zip_longest
+
+from graph import INDEX, OFFSET, StarGraph
+
+try:
+    import numpy
+    import pandas
+except ImportError:
+    pandas = None
+
+CHUNK_ROWS = 1 << 16
+
+# 10 to 10 ** 18, for counting the digits of non-negative int64s
+POWERS_OF_TEN = [10 ** power for power in range(1, 19)]
+
+PEOPLE = ("id", "name", "birth")
+MOVIES = ("id", "title", "year")
+STARS = ("person_id", "movie_id")
+
+
+def read_graph(directory, dropped=None):
+    """
+    Parses the CSV files in directory into a StarGraph. Fields missing
+    from short rows are read as empty strings, and (person_id, movie_id)
+    stars naming an unknown person or movie are appended to dropped if
+    it is given.
+    """
+    read = read_graph_pandas if pandas is not None else read_graph_csv
+
+    # Everything allocated here lives on, so the cyclic collector would
+    # only rescan the growing heap over and over
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return read(directory, dropped)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def read_graph_csv(directory, dropped):
+    people = read_table(f"{directory}/people.csv", PEOPLE)
+    movies = read_table(f"{directory}/movies.csv", MOVIES)
+    stars = read_columns(f"{directory}/stars.csv", STARS)
+    return StarGraph.from_columns(people, movies, stars, dropped)
+
+
+def read_columns(filename, columns, chunk_rows=CHUNK_ROWS):
+    """
+    Yields the named columns of a CSV file as sequences of strings,
+    chunk_rows rows at a time.
+    """
+    with open(filename, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise Exception(f"{filename} has no {', '.join(missing)} column")
+        positions = [header.index(column) for column in columns]
+
+        while True:
+            rows = list(islice(reader, chunk_rows))
+            if not rows:
+                break
+            if not all(rows):
+                rows = [row for row in rows if row]  # Blank lines
+            fields = list(zip_longest(*rows, fillvalue=""))
+            fields += [("",) * len(rows)] * (max(positions) + 1 - len(fields))
+            yield [fields[position] for position in positions]
+
+
+def read_table(filename, columns):
+    """Reads the named columns of a whole CSV file as lists; see read_columns."""
+    table = [[] for _ in columns]
+    for chunk in read_columns(filename, columns):
+        for column, values in zip(table, chunk):
+            column.extend(values)
+    return table
+
+
+def read_graph_pandas(directory, dropped):
+    people = pandas.concat(read_frames(f"{directory}/people.csv", PEOPLE, object))
+    movies = pandas.concat(read_frames(f"{directory}/movies.csv", MOVIES, object))
+    person_count = len(people)
+    movie_count = len(movies)
+    find_person = indexer(people["id"])
+    find_movie = indexer(movies["id"])
+
+    # Intern each chunk of stars to person * movie_count + movie keys
+    keys = [numpy.empty(0, numpy.int64)]
+    for chunk in read_frames(f"{directory}/stars.csv", STARS, object):
+        persons = find_person(chunk["person_id"])
+        films = find_movie(chunk["movie_id"])
+        known = (persons >= 0) & (films >= 0)
+        if not known.all():
+            if dropped is not None:
+                dropped.extend(chunk[~known].astype(str).itertuples(index=False, name=None))
+            persons = persons[known]
+            films = films[known]
+        keys.append(persons.astype(numpy.int64) * movie_count + films)
+
+    # Sorting the keys orders them by person, then drop duplicates
+    keys = numpy.concatenate(keys)
+    keys.sort()
+    if len(keys):
+        keys = keys[numpy.concatenate(([True], keys[1:] != keys[:-1]))]
+    persons, films = numpy.divmod(keys, max(movie_count, 1))
+    by_movie = numpy.lexsort((persons, films))
+
+    return StarGraph.from_arrays(
+        [people[column].tolist() for column in PEOPLE],
+        [movies[column].tolist() for column in MOVIES],
+        offsets_of(persons, person_count), array(INDEX, films.astype(INDEX).tobytes()),
+        offsets_of(films[by_movie], movie_count), array(INDEX, persons[by_movie].astype(INDEX).tobytes()),
+    )
+
+
+def read_frames(filename, columns, dtype, chunk_rows=CHUNK_ROWS * 4):
+    """read_columns for pandas, yielding DataFrame chunks of the given dtype."""
+    try:
+        chunks = pandas.read_csv(
+            filename, usecols=list(columns), dtype=dtype, keep_default_na=False, chunksize=chunk_rows
+        )
+    except ValueError as error:
+        raise Exception(f"{filename}: {error}")
+
+    with chunks:
+        for chunk in chunks:
+            yield chunk[list(columns)]
+
+
+def indexer(ids):
+    """
+    Returns a function mapping a column of ids to numpy positions in ids,
+    or -1 for unknown ids. As with a dict, the last of any duplicate wins.
+    Ids are matched as integers, which is far faster, whenever both ids
+    and the column are plain decimals, and as strings otherwise.
+    """
+    numbers = integers(ids)
+
+    @functools.cache
+    def positions(by_number):
+        series = pandas.Series(numpy.arange(len(ids)), index=numbers if by_number else ids.to_numpy())
+        series = series[~series.index.duplicated(keep="last")]
+        return series.index, series.to_numpy()
+
+    def find(column):
+        column_numbers = integers(column) if numbers is not None else None
+        by_number = column_numbers is not None
+        index, values = positions(by_number)
+        found = index.get_indexer(column_numbers if by_number else column.to_numpy())
+        return numpy.where(found >= 0, values[found], -1)
+
+    return find
+
+
+def integers(strings):
+    """
+    Returns a column of strings as an int64 array if every one is written
+    as a plain decimal integer, so that the numbers are equal exactly when
+    the strings are; otherwise None.
+    """
+    values = strings.to_numpy()
+    try:
+        numbers = values.astype(numpy.int64)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+    # A plain decimal is ASCII with no sign, spaces, underscores or leading
+    # zeros, so it is exactly as long as its number has digits
+    if (numbers < 0).any() or not "".join(values).isascii():
+        return None
+    lengths = numpy.fromiter(map(len, values), numpy.int64, len(values))
+    digits = numpy.searchsorted(POWERS_OF_TEN, numbers, side="right") + 1
+    if not numpy.array_equal(lengths, digits):
+        return None
+    return numbers
+
+
+def offsets_of(sources, count):
+    """Returns the CSR offsets array for sorted sources numbered 0 to count - 1."""
+    offsets = numpy.zeros(count + 1, numpy.int64)
+    numpy.cumsum(numpy.bincount(sources, minlength=count), out=offsets[1:])
+    return array(OFFSET, offsets.astype(OFFSET).tobytes())
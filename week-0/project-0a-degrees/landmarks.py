@@ -0,0 +1,167 @@
+"""
+Landmark distance oracle for a StarGraph.
+
+A handful of well-connected "landmark" people each get a breadth-first
+distance to everyone, stored one byte per person. By the triangle
+inequality, for any landmark L:
+
+    |d(s, L) - d(t, L)| <= d(s, t) <= d(s, L) + d(L, t)
+
+so the arrays give instant lower and upper bounds on the degrees of
+separation, and the lower bound is an admissible A* heuristic.
+"""
+
+import json
+import math
+import os
+import struct
+from heapq import nlargest
+
+from graph import replacing
+
+# Distance byte for people a landmark cannot reach; distances are capped
+# one below it, which keeps lower bounds valid but not upper ones
+UNREACHABLE = 255
+CAPPED = UNREACHABLE - 1
+
+MAGIC = b"LANDMARK"
+
+
+class LandmarkOracle():
+    def __init__(self, landmarks, distances):
+        self.landmarks = landmarks
+        self.distances = distances
+
+    @classmethod
+    def build(cls, graph, k=8):
+        """Picks the k people with the most co-star slots and runs a BFS from each."""
+        def degree(person):
+            return sum(len(graph.stars_of(movie)) for movie in graph.movies_of(person))
+
+        landmarks = nlargest(k, range(graph.person_count), key=degree)
+        return cls(landmarks, [distances_from(graph, landmark) for landmark in landmarks])
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the distance between two person
+        indices. lower is math.inf if a landmark proves they are not
+        connected; upper is math.inf if no landmark reaches both.
+        """
+        lower = 0
+        upper = math.inf
+        for distances in self.distances:
+            s, t = distances[source], distances[target]
+            if (s == UNREACHABLE) != (t == UNREACHABLE):
+                return math.inf, math.inf
+            if s != UNREACHABLE:
+                lower = max(lower, abs(s - t))
+                if s != CAPPED and t != CAPPED:
+                    upper = min(upper, s + t)
+        return lower, upper
+
+    def heuristic(self, person, target):
+        """Admissible estimate of the distance from person to target."""
+        estimate = 0
+        for distances in self.distances:
+            s, t = distances[person], distances[target]
+            if s != UNREACHABLE and t != UNREACHABLE:
+                estimate = max(estimate, abs(s - t))
+        return estimate
+
+    def path(self, graph, source, target):
+        """
+        Returns a path of (movie, person) index pairs from source to target
+        through the landmark giving the upper bound, by walking down its
+        distances from both ends. Both people must be reachable from it.
+        """
+        distances = min(
+            (distances for distances in self.distances
+             if distances[source] < CAPPED and distances[target] < CAPPED),
+            key=lambda distances: distances[source] + distances[target]
+        )
+        outward = descend(graph, distances, source)
+        inward = descend(graph, distances, target)
+
+        # outward runs source -> landmark; inward is target -> landmark, so
+        # reverse it, pairing each person with the movie leading onwards
+        path = outward
+        people = [target] + [person for _, person in inward]
+        for i in range(len(inward) - 1, -1, -1):
+            path.append((inward[i][0], people[i]))
+        return path
+
+    def save(self, filename, source=None):
+        people = len(self.distances[0]) if self.distances else 0
+        header = json.dumps({"source": source, "landmarks": self.landmarks, "people": people}).encode()
+        with replacing(filename) as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for distances in self.distances:
+                f.write(distances)
+
+    @classmethod
+    def load(cls, filename, source=None, k=None):
+        """
+        Reads an oracle written by save(); returns None if the file is
+        missing, truncated, was saved with a different source, or has a
+        different k.
+        """
+        try:
+            with open(filename, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    return None
+                (length,) = struct.unpack("<Q", f.read(8))
+                if length > os.fstat(f.fileno()).st_size:
+                    return None  # A corrupt length; don't try to read it
+                header = json.loads(f.read(length))
+                if header["source"] != source or (k is not None and len(header["landmarks"]) != k):
+                    return None
+                landmarks, size = header["landmarks"], header["people"]
+                data = f.read()
+        except (OSError, ValueError, struct.error, KeyError, TypeError):
+            return None
+
+        # One distance byte per person for each landmark, no more, no less
+        if not isinstance(size, int) or len(data) != len(landmarks) * size:
+            return None
+        if not landmarks:
+            return cls([], [])
+        return cls(landmarks, [bytearray(data[i * size:(i + 1) * size]) for i in range(len(landmarks))])
+
+
+def descend(graph, distances, person):
+    """
+    Returns (movie, person) steps from person to the landmark whose
+    distances are given, each one step closer.
+    """
+    steps = []
+    while distances[person] != 0:
+        closer = distances[person] - 1
+        for movie, neighbor in graph.adjacent(person):
+            if distances[neighbor] == closer:
+                steps.append((movie, neighbor))
+                person = neighbor
+                break
+    return steps
+
+
+def distances_from(graph, source):
+    """
+    Returns a bytearray of every person's distance from source, capped
+    at CAPPED, with UNREACHABLE for people in other components.
+    """
+    distances = bytearray([UNREACHABLE]) * graph.person_count
+    distances[source] = 0
+    layer = [source]
+    depth = 0
+    while layer:
+        depth = min(depth + 1, CAPPED)
+        next_layer = []
+        for person in layer:
+            for _, neighbor in graph.adjacent(person):
+                if distances[neighbor] == UNREACHABLE:
+                    distances[neighbor] = depth
+                    next_layer.append(neighbor)
+        layer = next_layer
+    return distances
@@ -0,0 +1,124 @@
+"""
+Name lookups over a StarGraph: exact, prefix and fuzzy.
+
+All names are lowercased into one sorted list, which doubles as an
+implicit trie: the names sharing any prefix form a contiguous run that
+bisect finds in O(log n). Fuzzy search walks that trie depth first,
+carrying a row of the Levenshtein table per prefix, and abandons a
+prefix as soon as every entry in its row exceeds the allowed distance.
+Rows are only computed within the allowed distance of the diagonal, and
+once a prefix leaves a single name, its remaining characters are scored
+in a loop rather than split into runs one by one.
+"""
+
+from bisect import bisect_left
+
+
+class NameIndex():
+    def __init__(self, graph):
+        self.graph = graph
+        self.people = graph.name_order
+        self.keys = [graph.person_names[person].lower() for person in self.people]
+
+    def exact(self, name):
+        """Returns the indices of everyone called name, ignoring case."""
+        name = name.lower()
+        start = bisect_left(self.keys, name)
+        end = start
+        while end < len(self.keys) and self.keys[end] == name:
+            end += 1
+        return list(self.people[start:end])
+
+    def prefix(self, prefix, limit=10):
+        """Returns the indices of up to limit people whose name starts with prefix."""
+        prefix = prefix.lower()
+        start = bisect_left(self.keys, prefix)
+        result = []
+        for position in range(start, min(start + limit, len(self.keys))):
+            if not self.keys[position].startswith(prefix):
+                break
+            result.append(self.people[position])
+        return result
+
+    def fuzzy(self, name, max_distance=2, limit=10):
+        """
+        Returns up to limit (distance, person index) pairs for people whose
+        name is within max_distance edits of name, closest first.
+        """
+        name = name.lower()
+        matches = []
+        self.walk(name, max_distance, 0, list(range(len(name) + 1)), 0, len(self.keys), matches)
+        matches.sort()
+        return [(distance, self.people[position]) for distance, position in matches[:limit]]
+
+    def walk(self, name, max_distance, depth, row, start, end, matches):
+        """
+        Visits the run keys[start:end] of names sharing their first depth
+        characters, whose Levenshtein row against name is row.
+        """
+        keys = self.keys
+
+        # Names no longer than the shared prefix sort first in the run
+        while start < end and len(keys[start]) == depth:
+            if row[-1] <= max_distance:
+                matches.append((row[-1], start))
+            start += 1
+
+        # With one name left, finish its rows without splitting any further
+        if end - start == 1:
+            distance = self.finish(name, max_distance, keys[start], depth, row)
+            if distance <= max_distance:
+                matches.append((distance, start))
+            return
+
+        # Split the rest of the run by the character that follows the prefix
+        while start < end:
+            key = keys[start]
+            char = key[depth]
+            child_end = bisect_left(keys, key[:depth] + chr(ord(char) + 1), start, end)
+            next_row = step(name, max_distance, depth + 1, row, char)
+            if next_row is not None:
+                self.walk(name, max_distance, depth + 1, next_row, start, child_end, matches)
+            start = child_end
+
+    def finish(self, name, max_distance, key, depth, row):
+        """
+        Returns the distance from name to key, whose first depth characters
+        give row, or max_distance + 1 if it is further.
+        """
+        if abs(len(key) - len(name)) > max_distance:
+            return max_distance + 1  # Too many insertions or deletions
+        for depth in range(depth + 1, len(key) + 1):
+            row = step(name, max_distance, depth, row, key[depth - 1])
+            if row is None:
+                return max_distance + 1
+        return row[-1]
+
+
+def step(name, max_distance, depth, row, char):
+    """
+    Returns the Levenshtein row of a prefix depth characters long against
+    name, given the row of the prefix without its last character, char,
+    or None if every entry exceeds max_distance. Only entries within
+    max_distance of the diagonal can be that close, so only they are
+    computed; the rest, like any larger distance, are capped at
+    max_distance + 1.
+    """
+    cap = max_distance + 1
+    next_row = [cap] * (len(name) + 1)
+    best = next_row[0] = min(depth, cap)
+    low = max(1, depth - max_distance)
+    left = next_row[low - 1]
+    for i in range(low, min(len(name), depth + max_distance) + 1):
+        # Cheapest of a substitution (or match), a deletion and an insertion
+        value = row[i - 1] if name[i - 1] == char else row[i - 1] + 1
+        if row[i] < value:
+            value = row[i] + 1
+        if left < value:
+            value = left + 1
+        if value > cap:
+            value = cap
+        next_row[i] = left = value
+        if value < best:
+            best = value
+    return next_row if best <= max_distance else None
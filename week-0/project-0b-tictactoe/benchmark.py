@@ -0,0 +1,137 @@
+"""
+Microbenchmarks for the Tic Tac Toe engines.
+
+Usage: python benchmark.py [nodes] [minimax] [mnk] [book]
+"""
+
+import sys
+import time
+
+import bitboard
+import tictactoe
+from mnk import MNKGame
+
+
+def count_lists(board):
+    """Visits the whole game tree below board through the nested-list API; returns the node count."""
+    if tictactoe.terminal(board):
+        return 1
+    return 1 + sum(count_lists(tictactoe.result(board, action)) for action in tictactoe.actions(board))
+
+
+def count_adapter(board):
+    """count_lists through bitboard's nested-list adapter."""
+    if bitboard.terminal(board):
+        return 1
+    return 1 + sum(count_adapter(bitboard.result(board, action)) for action in bitboard.actions(board))
+
+
+def count_bits(x, o):
+    """count_lists directly on bitboards, X to move when both have as many cells."""
+    if bitboard.over(x, o):
+        return 1
+    nodes = 1
+    free = bitboard.FULL & ~(x | o)
+    x_turn = x.bit_count() == o.bit_count()
+    while free:
+        move = free & -free
+        free ^= move
+        nodes += count_bits(x | move, o) if x_turn else count_bits(x, o | move)
+    return nodes
+
+
+def bench_nodes():
+    """Nodes per second visiting the full game tree (no pruning) from the empty board."""
+    walks = [
+        ("lists", lambda: count_lists(tictactoe.initial_state())),
+        ("adapter", lambda: count_adapter(bitboard.initial_state())),
+        ("bits", lambda: count_bits(0, 0)),
+    ]
+    print(f"{'engine':>8} {'nodes':>8} {'seconds':>8} {'nodes/s':>10}")
+    for name, walk in walks:
+        start = time.perf_counter()
+        nodes = walk()
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8} {nodes:8} {elapsed:8.2f} {nodes / elapsed:10.0f}")
+
+
+def bench_minimax():
+    """First-move minimax on the empty board, with empty transposition tables and no opening book."""
+    # No book file, so tictactoe.minimax searches rather than looking its move up
+    book_file = tictactoe.BOOK_FILE
+    tictactoe.BOOK_FILE, tictactoe.book = "", None
+
+    print(f"{'engine':>8} {'nodes':>8} {'ms':>8}")
+    for name, engine in (("lists", tictactoe), ("bits", bitboard)):
+        engine.transpositions.clear()
+        start = time.perf_counter()
+        engine.minimax(engine.initial_state())
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8} {engine.nodes_searched:8} {elapsed * 1000:8.2f}")
+    tictactoe.BOOK_FILE, tictactoe.book = book_file, None
+
+
+def bench_mnk(games=((3, 3, 3), (4, 4, 4), (5, 5, 4), (7, 7, 5))):
+    """Self-play on bigger boards under the default time budget: per-move time and nodes."""
+    print(f"{'game':>8} {'moves':>6} {'mean ms':>8} {'worst ms':>9} {'nodes/move':>11} {'winner':>7}")
+    for m, n, k in games:
+        game = MNKGame(m, n, k)
+        board = game.initial_state()
+        times = []
+        nodes = 0
+        while not game.terminal(board):
+            start = time.perf_counter()
+            move = game.minimax(board)
+            times.append(time.perf_counter() - start)
+            nodes += game.nodes_searched
+            board = game.result(board, move)
+        print(f"{f'{m},{n},{k}':>8} {len(times):6} {sum(times) / len(times) * 1000:8.1f} "
+              f"{max(times) * 1000:9.1f} {nodes // len(times):11} {game.winner(board) or '-':>7}")
+
+
+def bench_book():
+    """tictactoe.minimax over every reachable position, answering from book.py's book and by search."""
+    boards, frontier, seen = [], [tictactoe.initial_state()], set()
+    while frontier:
+        board = frontier.pop()
+        index = tictactoe.board_index(board)
+        if index not in seen and not tictactoe.terminal(board):
+            seen.add(index)
+            boards.append(board)
+            frontier.extend(tictactoe.result(board, action) for action in tictactoe.actions(board))
+
+    print(f"{'source':>8} {'positions':>10} {'nodes':>8} {'us/move':>8}")
+    book_file = tictactoe.BOOK_FILE
+    for name, filename in (("book", book_file), ("search", None)):
+        # No file for the search run, so minimax falls back to searching
+        tictactoe.BOOK_FILE, tictactoe.book = filename or "", None
+        tictactoe.transpositions.clear()
+        nodes = 0
+        start = time.perf_counter()
+        for board in boards:
+            tictactoe.minimax(board)
+            nodes += tictactoe.nodes_searched
+        elapsed = time.perf_counter() - start
+        print(f"{name:>8} {len(boards):10} {nodes:8} {elapsed / len(boards) * 1e6:8.1f}")
+    tictactoe.BOOK_FILE, tictactoe.book = book_file, None
+
+
+BENCHMARKS = {
+    "nodes": bench_nodes,
+    "minimax": bench_minimax,
+    "mnk": bench_mnk,
+    "book": bench_book,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            sys.exit(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+        print(f"== {name}")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Bitboard Tic Tac Toe engine.
+
+A position is two 9-bit ints, the cells X and O occupy, with cell (i, j)
+at bit 3 * i + j. The free cells are the clear bits of their union, and
+a player has won if their bits cover any of the 8 LINES, which WINS
+precomputes for all 512 bit patterns.
+
+The functions at the bottom wrap the engine in the same API as
+tictactoe.py, taking and returning nested-list boards, so runner.py can
+use either module.
+"""
+
+import math
+from typing import Tuple, Union
+
+from tictactoe import (
+    X, O, EMPTY, SYMMETRIES, EXACT, LOWER, UPPER,
+    Board, EmptyBoard, BoardAction, BoardActionSet, PlayerSign, Score,
+)
+
+# Bits of a position: (X's cells, O's cells)
+Bits = Tuple[int, int]
+
+FULL = 0b111_111_111
+
+# Rows, columns and diagonals
+LINES = (
+    0b000_000_111, 0b000_111_000, 0b111_000_000,
+    0b001_001_001, 0b010_010_010, 0b100_100_100,
+    0b100_010_001, 0b001_010_100,
+)
+
+# WINS[bits] is 1 if bits cover a line, 0 otherwise
+WINS = bytes(any(bits & line == line for line in LINES) for bits in range(1 << 9))
+
+# Cell of each bit
+CELLS = tuple((i, j) for i in range(3) for j in range(3))
+
+# Single-bit moves in search order: center, corners, then edges
+MOVE_ORDER = tuple(1 << (3 * i + j) for i, j in ((1, 1), (0, 0), (0, 2), (2, 0), (2, 2), (0, 1), (1, 0), (1, 2), (2, 1)))
+
+# For each symmetry, a table mapping bit patterns to their transformed pattern
+SYMMETRY_TABLES = tuple(
+    tuple(
+        sum(1 << k for k, (i, j) in enumerate(symmetry) if bits >> (3 * i + j) & 1)
+        for bits in range(1 << 9)
+    )
+    for symmetry in SYMMETRIES
+)
+
+# Transposition table: canonical (mover, other) key -> (score, kind), with
+# scores from the point of view of the player to move
+transpositions = {}
+
+# Number of positions visited by the last minimax search
+nodes_searched = 0
+
+
+def to_bits(board: Board) -> Bits:
+    """
+    Returns the (X, O) bits of a nested-list board.
+    """
+    x = o = 0
+    for bit, (i, j) in enumerate(CELLS):
+        if board[i][j] == X:
+            x |= 1 << bit
+        elif board[i][j] == O:
+            o |= 1 << bit
+    return x, o
+
+
+def to_board(x: int, o: int) -> Board:
+    """
+    Returns the nested-list board for (X, O) bits.
+    """
+    return [
+        [X if x >> (3 * i + j) & 1 else O if o >> (3 * i + j) & 1 else EMPTY for j in range(3)]
+        for i in range(3)
+    ]
+
+
+def over(x: int, o: int) -> bool:
+    """
+    Returns True if either player has a line or the board is full.
+    """
+    return bool(WINS[x] or WINS[o]) or x | o == FULL
+
+
+def canonical_key(mover: int, other: int) -> int:
+    """
+    Returns the same key for a position and all its rotations and
+    reflections. Only whose turn it is matters, not whether that is X or
+    O, so the key is built from the mover's and the other player's bits.
+    """
+    return min(table[mover] << 9 | table[other] for table in SYMMETRY_TABLES)
+
+
+def negamax(mover: int, other: int, alpha: int, beta: int) -> Score:
+    """
+    Returns the score of a position for the player to move, whose cells
+    are mover, searching between alpha and beta.
+    """
+    global nodes_searched
+    nodes_searched += 1
+
+    if WINS[other]:
+        return -1  # The other player just won
+    free = FULL & ~(mover | other)
+    if not free:
+        return 0
+
+    key = canonical_key(mover, other)
+    if key in transpositions:
+        score, kind = transpositions[key]
+        if kind == EXACT or (kind == LOWER and score >= beta) or (kind == UPPER and score <= alpha):
+            return score
+
+    best = -1
+    window_alpha = alpha
+    for move in MOVE_ORDER:
+        if free & move:
+            best = max(best, -negamax(other, mover | move, -beta, -alpha))
+            if best >= beta:
+                break  # Prune
+            alpha = max(alpha, best)
+
+    if best <= window_alpha:
+        transpositions[key] = (best, UPPER)
+    elif best >= beta:
+        transpositions[key] = (best, LOWER)
+    else:
+        transpositions[key] = (best, EXACT)
+    return best
+
+
+def initial_state() -> EmptyBoard:
+    """
+    Returns starting state of the board.
+    """
+    return to_board(0, 0)
+
+
+def player(board: Board) -> PlayerSign:
+    """
+    Returns player who has the next turn on a board.
+    """
+    x, o = to_bits(board)
+    if over(x, o):
+        return None  # Game is already over
+    return X if x.bit_count() == o.bit_count() else O
+
+
+def actions(board: Board) -> BoardActionSet:
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+    x, o = to_bits(board)
+    free = FULL & ~(x | o)
+    return {CELLS[bit] for bit in range(9) if free >> bit & 1} or None
+
+
+def result(board: Board, action: BoardAction) -> Board:
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+    i, j = action
+    if i not in range(3) or j not in range(3):
+        raise Exception("Invalid move!")
+
+    x, o = to_bits(board)
+    move = 1 << (3 * i + j)
+    if (x | o) & move:
+        raise Exception(f"Invalid action! ({i}, {j})")
+
+    if x.bit_count() == o.bit_count():
+        return to_board(x | move, o)
+    return to_board(x, o | move)
+
+
+def winner(board: Board) -> PlayerSign:
+    """
+    Returns the winner of the game, if there is one.
+    """
+    x, o = to_bits(board)
+    return X if WINS[x] else O if WINS[o] else None
+
+
+def terminal(board: Board) -> bool:
+    """
+    Returns True if game is over, False otherwise.
+    """
+    return over(*to_bits(board))
+
+
+def utility(board: Board) -> Score:
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    x, o = to_bits(board)
+    return 1 if WINS[x] else -1 if WINS[o] else 0
+
+
+def minimax(board: Board) -> Union[BoardAction, None]:
+    """
+    Returns the optimal action for the current player on the board.
+    """
+    global nodes_searched
+    nodes_searched = 0
+
+    x, o = to_bits(board)
+    if over(x, o):
+        return None
+    mover, other = (x, o) if x.bit_count() == o.bit_count() else (o, x)
+    free = FULL & ~(x | o)
+
+    # Optimal move is the one with the highest score for the mover
+    best_score, best_move = -math.inf, None
+    for move in MOVE_ORDER:
+        if free & move:
+            score = -negamax(other, mover | move, -1, -max(best_score, -1))
+            if score > best_score:
+                best_score, best_move = score, move
+                if best_score == 1:
+                    break  # Can't do better than a win
+
+    return CELLS[best_move.bit_length() - 1]
@@ -0,0 +1,74 @@
+"""
+Builds the opening book that tictactoe.minimax answers from.
+
+Solves every position reachable from the empty board, then writes
+tictactoe.BOOK_FILE: one byte per base-3 board index (see
+tictactoe.board_index), holding the best cell i * 3 + j for the player
+to move, or tictactoe.NO_MOVE for unreachable and finished positions.
+Among equally good moves it prefers the quickest win or slowest loss,
+then tictactoe.MOVE_ORDER.
+
+Usage: python book.py
+"""
+
+import tictactoe as ttt
+
+
+def solve(board, scores):
+    """
+    Returns the score of board for X, memoized in scores by board index:
+    10 less the marks on the board when X wins, the negative of that when
+    O wins, 0 for a draw.
+    """
+    index = ttt.board_index(board)
+    if index not in scores:
+        if ttt.terminal(board):
+            marks = sum(cell is not ttt.EMPTY for row in board for cell in row)
+            scores[index] = ttt.utility(board) * (10 - marks)
+        else:
+            children = [solve(ttt.result(board, action), scores) for action in ttt.actions(board)]
+            scores[index] = max(children) if ttt.player(board) == ttt.X else min(children)
+    return scores[index]
+
+
+def build():
+    """
+    Returns the book's bytes and the number of positions with a move.
+    """
+    book = bytearray([ttt.NO_MOVE]) * ttt.BOOK_SIZE
+    scores = {}
+    solve(ttt.initial_state(), scores)
+
+    positions = 0
+    frontier = [ttt.initial_state()]
+    seen = {ttt.board_index(frontier[0])}
+    while frontier:
+        board = frontier.pop()
+        if ttt.terminal(board):
+            continue
+
+        # Best move for the player to move, first in MOVE_ORDER among ties
+        sign = 1 if ttt.player(board) == ttt.X else -1
+        moves = sorted(ttt.actions(board), key=ttt.MOVE_ORDER.__getitem__)
+        best = max(moves, key=lambda action: sign * scores[ttt.board_index(ttt.result(board, action))])
+        book[ttt.board_index(board)] = best[0] * 3 + best[1]
+        positions += 1
+
+        for action in moves:
+            child = ttt.result(board, action)
+            if ttt.board_index(child) not in seen:
+                seen.add(ttt.board_index(child))
+                frontier.append(child)
+
+    return bytes(book), positions
+
+
+def main():
+    book, positions = build()
+    with open(ttt.BOOK_FILE, "wb") as f:
+        f.write(book)
+    print(f"Wrote {ttt.BOOK_FILE}: best moves for {positions} positions in {len(book)} bytes")
+
+
+if __name__ == "__main__":
+    main()
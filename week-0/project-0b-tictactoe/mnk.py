@@ -0,0 +1,324 @@
+"""
+m,n,k-game engine: Tic Tac Toe on an m-row, n-column board, won by k
+marks in a row.
+
+MNKGame has the same functions as tictactoe.py, as methods, so
+runner.py can play any size of board. Searching to the end of the game
+is hopeless beyond 3x3, so minimax runs iterative-deepening alpha-beta
+against a time budget instead. Positions where it stops are scored by
+their open lines, the k-cell lines only one player has marks in. Moves
+are tried in order: the transposition table's best move, then the
+killer moves that caused cutoffs at the same depth, then by history
+score.
+"""
+
+import math
+import time
+from typing import List, Union
+
+from tictactoe import (
+    X, O, EMPTY, EXACT, LOWER, UPPER,
+    Board, BoardAction, BoardActionSet, PlayerSign, Score,
+)
+
+# Score of a win for the player who makes it, less the number of marks
+# on the board by then, so quicker wins score higher
+WIN = 1_000_000
+
+# How often, in nodes, a search checks its time budget
+CHECK_EVERY = 256
+
+# Most transposition table entries kept between moves; a 7x7 game leaves
+# about 100k, so this is a few games' worth
+MAX_TRANSPOSITIONS = 1 << 18
+
+
+class Timeout(Exception):
+    """Raised inside a search when its time budget has run out."""
+
+
+class MNKGame():
+    X = X
+    O = O
+    EMPTY = EMPTY
+
+    def __init__(self, m: int = 3, n: int = 3, k: int = 3, time_limit: float = 0.2):
+        if not 1 <= k <= max(m, n):
+            raise Exception(f"Can't make {k} in a row on a {m}x{n} board")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.time_limit = time_limit
+
+        # Every line of k cells, as flat indices i * n + j
+        self.lines: List[tuple] = []
+        for i in range(m):
+            for j in range(n):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    if 0 <= i + di * (k - 1) < m and 0 <= j + dj * (k - 1) < n:
+                        self.lines.append(tuple((i + di * step) * n + j + dj * step for step in range(k)))
+
+        # Indices of the lines through each cell
+        self.cell_lines = [[] for _ in range(m * n)]
+        for index, line in enumerate(self.lines):
+            for cell in line:
+                self.cell_lines[cell].append(index)
+
+        # Worth of an open line holding count marks; each extra mark counts 4 times as much
+        self.weights = [0] + [4 ** count for count in range(k)]
+
+        # Cells on the most lines first, for when the history has nothing to say
+        self.cell_order = sorted(range(m * n), key=lambda cell: -len(self.cell_lines[cell]))
+
+        # Transposition table: (X cell bits, O cell bits) -> (depth, score, kind, best move),
+        # with scores for the player to move. Emptied for each new game, and
+        # whenever it outgrows MAX_TRANSPOSITIONS
+        self.transpositions = {}
+
+        # Number of positions visited by the last minimax search
+        self.nodes_searched = 0
+
+    def initial_state(self) -> Board:
+        """
+        Returns starting state of the board, forgetting the last game's
+        transpositions.
+        """
+        self.transpositions.clear()
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board: Board) -> PlayerSign:
+        """
+        Returns player who has the next turn on a board.
+        """
+        if self.terminal(board):
+            return None  # Game is already over
+
+        # X moves first, so it's X's turn whenever both have as many marks
+        marks = [cell for row in board for cell in row]
+        return X if marks.count(X) == marks.count(O) else O
+
+    def actions(self, board: Board) -> BoardActionSet:
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        actions_set: BoardActionSet = set()
+
+        for i in range(self.m):
+            for j in range(self.n):
+                if board[i][j] == EMPTY:
+                    actions_set.add((i, j))
+
+        return actions_set or None
+
+    def result(self, board: Board, action: BoardAction) -> Board:
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if i not in range(self.m) or j not in range(self.n):
+            raise Exception("Invalid move!")
+
+        if board[i][j] is not EMPTY:
+            raise Exception(f"Invalid action! ({i}, {j})")
+
+        copy_board: Board = [row[:] for row in board]
+        copy_board[i][j] = self.player(board)
+        return copy_board
+
+    def winner(self, board: Board) -> PlayerSign:
+        """
+        Returns the winner of the game, if there is one.
+        """
+        for line in self.lines:
+            first = board[line[0] // self.n][line[0] % self.n]
+            if first is not EMPTY and all(board[cell // self.n][cell % self.n] == first for cell in line):
+                return first
+        return None
+
+    def terminal(self, board: Board) -> bool:
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return self.winner(board) is not None or all(cell is not EMPTY for row in board for cell in row)
+
+    def utility(self, board: Board) -> Score:
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        game_winner: PlayerSign = self.winner(board)
+        return 1 if game_winner == X else -1 if game_winner == O else 0
+
+    def minimax(self, board: Board, time_limit: float = None) -> Union[BoardAction, None]:
+        """
+        Returns the best action found for the current player on the board
+        within time_limit seconds (by default the game's time_limit). The
+        result is optimal whenever the search reaches the end of the game
+        in time, as it always does on 3x3.
+        """
+        if self.terminal(board):
+            return None
+
+        deadline = time.perf_counter() + (self.time_limit if time_limit is None else time_limit)
+        if len(self.transpositions) > MAX_TRANSPOSITIONS:
+            self.transpositions.clear()
+        search = Search(self, [cell for row in board for cell in row])
+        side = 0 if self.player(board) == X else 1
+
+        best_move = None
+        for depth in range(1, search.empty + 1):
+            # Always finish depth 1, so there is a move to return
+            search.deadline = deadline if best_move is not None else math.inf
+            try:
+                score, best_move = search.root(depth, side)
+            except Timeout:
+                break
+            if abs(score) > WIN - self.m * self.n - 1:
+                break  # The game's outcome is settled
+
+        self.nodes_searched = search.nodes
+        return divmod(best_move, self.n)
+
+
+class Search():
+    """
+    State of one minimax call: a flat copy of the board that moves are
+    made on and taken back in place, each line's mark counts, and the
+    evaluation from X's point of view, all kept up to date move by move.
+    """
+
+    def __init__(self, game: MNKGame, cells: list):
+        self.game = game
+        self.cells = cells
+        self.empty = cells.count(EMPTY)
+        self.deadline = math.inf
+        self.nodes = 0
+
+        # Bitmasks of the cells X (0) and O (1) hold, for transposition keys
+        self.bits = [0, 0]
+        for cell, mark in enumerate(cells):
+            if mark is not EMPTY:
+                self.bits[mark == O] |= 1 << cell
+
+        # [X marks, O marks] in each line
+        self.counts = [[0, 0] for _ in game.lines]
+        for counts, line in zip(self.counts, game.lines):
+            for cell in line:
+                if cells[cell] is not EMPTY:
+                    counts[cells[cell] == O] += 1
+        self.score = sum(self.line_value(counts) for counts in self.counts)
+
+        # Two killer moves per ply, and a history score per side and cell
+        self.killers = [[None, None] for _ in range(len(cells) + 1)]
+        self.history = [[0] * len(cells) for _ in range(2)]
+
+    def line_value(self, counts: list) -> int:
+        x_marks, o_marks = counts
+        if o_marks == 0:
+            return self.game.weights[x_marks]
+        if x_marks == 0:
+            return -self.game.weights[o_marks]
+        return 0  # Blocked for both
+
+    def make(self, cell: int, side: int) -> bool:
+        """
+        Puts side's mark on cell; returns whether that completes a line.
+        """
+        won = False
+        self.cells[cell] = (X, O)[side]
+        self.bits[side] |= 1 << cell
+        self.empty -= 1
+        for index in self.game.cell_lines[cell]:
+            counts = self.counts[index]
+            before = self.line_value(counts)
+            counts[side] += 1
+            self.score += self.line_value(counts) - before
+            won = won or counts[side] == self.game.k
+        return won
+
+    def unmake(self, cell: int, side: int) -> None:
+        """
+        Takes side's mark back off cell.
+        """
+        self.cells[cell] = EMPTY
+        self.bits[side] &= ~(1 << cell)
+        self.empty += 1
+        for index in self.game.cell_lines[cell]:
+            counts = self.counts[index]
+            before = self.line_value(counts)
+            counts[side] -= 1
+            self.score += self.line_value(counts) - before
+
+    def ordered_moves(self, side: int, ply: int, first: int) -> list:
+        """
+        Returns the empty cells, first (if any) first, then the killers at
+        ply, then the rest by history score.
+        """
+        history = self.history[side]
+        moves = sorted(
+            (cell for cell in self.game.cell_order if self.cells[cell] is EMPTY),
+            key=lambda cell: -history[cell],
+        )
+        for move in reversed([first] + self.killers[ply]):
+            if move is not None and self.cells[move] is EMPTY:
+                moves.remove(move)
+                moves.insert(0, move)
+        return moves
+
+    def root(self, depth: int, side: int) -> tuple:
+        """
+        Searches depth moves ahead; returns (score for side, best move).
+        """
+        score = self.negamax(depth, 0, -math.inf, math.inf, side)
+        return score, self.game.transpositions[tuple(self.bits)][3]
+
+    def negamax(self, depth: int, ply: int, alpha: float, beta: float, side: int) -> float:
+        """
+        Returns the score of the position for side, the player to move,
+        looking depth moves ahead between alpha and beta.
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and time.perf_counter() > self.deadline:
+            raise Timeout()
+
+        if depth == 0:
+            return self.score if side == 0 else -self.score
+
+        key = tuple(self.bits)
+        entry = self.game.transpositions.get(key)
+        first = None
+        if entry is not None:
+            stored_depth, score, kind, first = entry
+            if stored_depth >= depth and (
+                kind == EXACT or (kind == LOWER and score >= beta) or (kind == UPPER and score <= alpha)
+            ):
+                return score
+
+        window_alpha = alpha
+        best, best_move = -math.inf, None
+        for cell in self.ordered_moves(side, ply, first):
+            if self.make(cell, side):
+                score = WIN - (self.game.m * self.game.n - self.empty)
+            elif self.empty == 0:
+                score = 0
+            else:
+                score = -self.negamax(depth - 1, ply + 1, -beta, -alpha, 1 - side)
+            self.unmake(cell, side)
+
+            if score > best:
+                best, best_move = score, cell
+            alpha = max(alpha, best)
+            if alpha >= beta:
+                # Remember the move that caused the cutoff
+                if cell != self.killers[ply][0]:
+                    self.killers[ply] = [cell, self.killers[ply][0]]
+                self.history[side][cell] += depth * depth
+                break  # Prune
+
+        if best <= window_alpha:
+            kind = UPPER
+        elif best >= beta:
+            kind = LOWER
+        else:
+            kind = EXACT
+        self.game.transpositions[key] = (depth, best, kind, best_move)
+        return best
@@ -4,6 +4,7 @@ Python Version: 3.10
 """
 
 import math
+import os
 from copy import deepcopy
 from typing import List, Tuple, Union, Literal
 
@@ -22,6 +23,48 @@ BoardAction = Tuple[int, int]
 BoardActionSet = {BoardAction}
 Score = Literal[-1, 0, 1]
 
+# The 8 rotations and reflections of the board, each as the (i, j) cell
+# that lands on every cell in row-major order
+SYMMETRIES = tuple(
+    tuple(transform(i, j) for i in range(3) for j in range(3))
+    for transform in (
+        lambda i, j: (i, j),
+        lambda i, j: (2 - j, i),
+        lambda i, j: (2 - i, 2 - j),
+        lambda i, j: (j, 2 - i),
+        lambda i, j: (i, 2 - j),
+        lambda i, j: (2 - i, j),
+        lambda i, j: (j, i),
+        lambda i, j: (2 - j, 2 - i),
+    )
+)
+
+# Cells tried first in searches: the center, then corners, then edges,
+# i.e. the cells on the most lines first, which finds cutoffs sooner
+MOVE_ORDER = {(1, 1): 0, (0, 0): 1, (0, 2): 1, (2, 0): 1, (2, 2): 1, (0, 1): 2, (1, 0): 2, (1, 2): 2, (2, 1): 2}
+
+# Kinds of score a transposition table entry can hold: the position's
+# exact score, or only a lower or upper bound on it after a cutoff
+EXACT = "exact"
+LOWER = "lower"
+UPPER = "upper"
+
+# Transposition table: canonical board key -> (score, kind), kept across
+# searches since scores never change
+transpositions = {}
+
+# Number of positions visited by the last minimax search
+nodes_searched = 0
+
+# Opening book written by book.py: for each base-3 board index, the best
+# cell i * 3 + j for the player to move, or NO_MOVE
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+BOOK_SIZE = 3 ** 9
+NO_MOVE = 255
+
+# Contents of BOOK_FILE once loaded, or b"" if it is missing
+book = None
+
 
 def initial_state() -> EmptyBoard:
     """
@@ -125,51 +168,151 @@ def utility(board: Board) -> Score:
     return 1 if game_winner == X else -1 if game_winner == O else 0
 
 
+def canonical_key(board: Board) -> str:
+    """
+    Returns the same string for a board and all its rotations and
+    reflections, which share a score.
+    """
+    return min(
+        "".join(board[i][j] or "." for i, j in symmetry)
+        for symmetry in SYMMETRIES
+    )
+
+
+def probe(key: str, alpha: Score, beta: Score) -> Union[Score, None]:
+    """
+    Returns the stored score for key if it settles a search between alpha
+    and beta, None otherwise.
+    """
+    if key not in transpositions:
+        return None
+
+    score, kind = transpositions[key]
+    if kind == EXACT or (kind == LOWER and score >= beta) or (kind == UPPER and score <= alpha):
+        return score
+    return None
+
+
+def store(key: str, score: Score, alpha: Score, beta: Score) -> None:
+    """
+    Stores the score a search between alpha and beta found for key.
+    """
+    if score <= alpha:
+        transpositions[key] = (score, UPPER)  # Failed low, true score may be lower
+    elif score >= beta:
+        transpositions[key] = (score, LOWER)  # Failed high, true score may be higher
+    else:
+        transpositions[key] = (score, EXACT)
+
+
+def board_index(board: Board) -> int:
+    """
+    Returns the board read as a base-3 number, cell (i, j) being digit
+    i * 3 + j, with EMPTY, X and O as 0, 1 and 2.
+    """
+    index = 0
+    for row in reversed(board):
+        for cell in reversed(row):
+            index = index * 3 + (0 if cell is EMPTY else 1 if cell == X else 2)
+    return index
+
+
+def book_move(board: Board) -> Union[BoardAction, None]:
+    """
+    Returns the opening book's move for the board, loading the book on
+    first use, or None if the book is missing or has no move for it.
+    """
+    global book
+    if book is None:
+        try:
+            with open(BOOK_FILE, "rb") as f:
+                book = f.read()
+        except OSError:
+            book = b""
+        if len(book) != BOOK_SIZE:
+            book = b""  # Missing or not a book; search instead
+
+    if not book:
+        return None
+    cell = book[board_index(board)]
+    if cell == NO_MOVE or board[cell // 3][cell % 3] is not EMPTY:
+        return None
+    return divmod(cell, 3)
+
+
 def min_player(board: Board, alpha: Score, beta: Score) -> Score:
+    global nodes_searched
+    nodes_searched += 1
+
     if terminal(board):
         return utility(board)
 
-    # Get all possible actions
-    possible_actions: BoardActionSet = actions(board)
+    key = canonical_key(board)
+    stored = probe(key, alpha, beta)
+    if stored is not None:
+        return stored
+
+    # Get all possible actions, most promising first
+    possible_actions = sorted(actions(board), key=MOVE_ORDER.__getitem__)
 
     # Minimize the score
     min_point = math.inf
+    window_beta = beta
     for action in possible_actions:
         min_point = min(min_point, max_player(result(board, action), alpha, beta))
         if min_point <= alpha:
             break  # Prune
-        alpha = min(alpha, min_point)  # Update alpha
+        beta = min(beta, min_point)  # Update beta
 
+    store(key, min_point, alpha, window_beta)
     return min_point
 
 
 def max_player(board: Board, alpha: Score, beta: Score) -> Score:
+    global nodes_searched
+    nodes_searched += 1
+
     if terminal(board):
         return utility(board)
 
-    # Get all possible actions
-    possible_actions: BoardActionSet = actions(board)
+    key = canonical_key(board)
+    stored = probe(key, alpha, beta)
+    if stored is not None:
+        return stored
+
+    # Get all possible actions, most promising first
+    possible_actions = sorted(actions(board), key=MOVE_ORDER.__getitem__)
 
     # Maximize the score
     max_point = -math.inf
+    window_alpha = alpha
     for action in possible_actions:
         max_point = max(max_point, min_player(result(board, action), alpha, beta))
         if max_point >= beta:
             break  # Prune
-        beta = max(beta, max_point)  # Update beta
+        alpha = max(alpha, max_point)  # Update alpha
 
+    store(key, max_point, window_alpha, beta)
     return max_point
 
 
 def minimax(board: Board) -> Union[BoardAction, None]:
     """
-    Returns the optimal action for the current player on the board.
+    Returns the optimal action for the current player on the board,
+    from the opening book if book.py has built one.
     """
+    global nodes_searched
+    nodes_searched = 0
+
     if terminal(board):
         return None
 
-    # Get all possible actions
-    possible_actions: BoardActionSet = actions(board)
+    move = book_move(board)
+    if move is not None:
+        return move
+
+    # Get all possible actions, most promising first
+    possible_actions = sorted(actions(board), key=MOVE_ORDER.__getitem__)
 
     # Get the current player
     ai_player: PlayerSign = player(board)
@@ -180,8 +323,10 @@ def minimax(board: Board) -> Union[BoardAction, None]:
         optimal_decision: (Score, BoardAction) = (-math.inf, None)
 
         for action in possible_actions:
-            action_score = min_player(result(board, action), optimal_decision[0], math.inf)
+            action_score = min_player(result(board, action), max(optimal_decision[0], -1), 1)
             optimal_decision = max(optimal_decision, (action_score, action), key=lambda item: item[0])
+            if optimal_decision[0] == 1:
+                break  # Can't do better than a win
 
         return optimal_decision[1]
 
@@ -189,7 +334,9 @@ def minimax(board: Board) -> Union[BoardAction, None]:
     optimal_decision: (Score, BoardAction) = (math.inf, None)
 
     for action in possible_actions:
-        action_score: Score = max_player(result(board, action), -math.inf, optimal_decision[0])
+        action_score: Score = max_player(result(board, action), -1, min(optimal_decision[0], 1))
         optimal_decision = min(optimal_decision, (action_score, action), key=lambda item: item[0])
+        if optimal_decision[0] == -1:
+            break  # Can't do better than a win
 
     return optimal_decision[1]